@@ -1,24 +1,34 @@
 from pathlib import Path
 from data.preprocessor import DataPreprocessor
-from data.loader import load
+from data.cache import SalesCache
 from data.schema import ColumnSchema
 from decompose.visualize import plot
 from decompose.decomposer import Decomposer, DecompositionConfig
+from forecast.batch import BatchForecaster
 from forecast.models.arima import ArimaConfig, ArimaForecaster
 from forecast.models.prophet import ProphetConfig, ProphetForecaster
+from forecast.models.registry import ModelRegistry
 from strategy.strategy import StationByProductStrategy, ProductStrategy
+from utils.instrumentation import TRACER
 
 
 if __name__ == "__main__":
 
     data_directory = Path("data/sales")
     save_directory = Path("results/")
+    cache_directory = Path("cache/")
+    model_directory = Path("models/")
 
-    sales = load(data_directory)
+    # TRACER.enable(trace_memory=False)
 
     schema = ColumnSchema()
     strategy = StationByProductStrategy(station=796, product='ADO')
 
+    sales = SalesCache(
+        directory=cache_directory, 
+        schema=schema
+    ).load_preprocessed(data_directory, strategy=strategy)
+
     # arima = ArimaForecaster(
     #     schema=schema,
     #     strategy=strategy,
@@ -28,6 +38,15 @@ if __name__ == "__main__":
     # arima.fit(sales=sales)
     # arima.evaluate()
 
+    # BatchForecaster(
+    #     schema=schema,
+    #     model_type=ArimaForecaster,
+    #     config=ArimaConfig(validation_days=30, trace=False),
+    #     directory=save_directory / "forecasts",
+    #     workers=4,
+    #     timeout=600
+    # ).run(sales=SalesCache(directory=cache_directory, schema=schema).load(data_directory))
+
     # decomposed_data = Decomposer(
     #         schema=schema,
     #         strategy=strategy,
@@ -48,7 +67,11 @@ if __name__ == "__main__":
     model.fit(sales=sales)
     model.evaluate()
 
-    model.predict()
-
+    # Refit on the validation window too before forecasting
+    model.fit(sales=sales, holdout=False)
+    model.save(ModelRegistry(directory=model_directory))
 
+    forecast = model.predict(days=7)
+    print(forecast.to_dataframe())
 
+    # TRACER.to_csv(save_directory / "trace.csv")
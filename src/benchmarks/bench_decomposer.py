@@ -0,0 +1,68 @@
+"""Serial versus process-parallel Decomposer on many station/product groups.
+
+Run from ``src``:  python -m benchmarks.bench_decomposer [stations] [workers...]
+"""
+import os
+import sys
+import time
+from dataclasses import replace
+
+import pandas as pd
+
+from benchmarks.synthetic import daily_sales_frame
+from data.schema import ColumnSchema
+from decompose.decomposer import Decomposer, DecompositionConfig
+from strategy.strategy import StationByProductStrategy
+
+
+if __name__ == "__main__":
+
+    stations = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    worker_counts = [int(w) for w in sys.argv[2:]] or [1, 2, 4, os.cpu_count() or 1]
+
+    schema = ColumnSchema()
+    sales = daily_sales_frame(stations=stations, schema=schema)
+    config = DecompositionConfig()
+
+    print(f"{stations * 4:,} groups x 365 days, {os.cpu_count()} cores")
+
+    baseline = None
+    reference = None
+
+    for workers in sorted(set(worker_counts)):
+
+        decomposer = Decomposer(
+            schema=schema,
+            strategy=StationByProductStrategy(),
+            config=replace(config, workers=workers),
+        )
+
+        start = time.perf_counter()
+        result = decomposer.decompose(sales)
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            baseline, reference = elapsed, result
+        else:
+            pd.testing.assert_frame_equal(result, reference)
+
+        print(f"workers={workers:<3} {elapsed:8.2f}s  speedup {baseline / elapsed:5.2f}x")
+
+    # Work left in the parent bounds the speedup on any number of cores
+    decomposer = Decomposer(schema=schema, strategy=StationByProductStrategy(), config=config)
+
+    start = time.perf_counter()
+    sources = list(decomposer._frame_sources(sales))
+    prepare = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batches = [decomposer._decompose_source(source, as_frame=True) for source in sources]
+    work = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pd.concat([frame for _, frame in batches], ignore_index=False)
+    combine = time.perf_counter() - start
+
+    serial = prepare + combine
+    print(f"parent: preprocess+slice {prepare:.2f}s, concat {combine:.2f}s | "
+          f"workers: {work:.2f}s | bound {(serial + work) / serial:.1f}x")
@@ -0,0 +1,40 @@
+"""Compare data.loader.load against data.loader.load_parallel.
+
+Run from ``src``:  python -m benchmarks.bench_loader [files] [rows_per_file]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import write_sales_csvs
+from data.loader import load, load_parallel
+
+
+def timed(label: str, func, repeat: int = 3):
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{label:<28} {best:8.3f}s  ({len(result):,} rows)")
+    return best
+
+
+if __name__ == "__main__":
+
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        directory = write_sales_csvs(Path(tmp), files=files, rows_per_file=rows)
+        print(f"{files} files x {rows} rows")
+
+        baseline = timed("load", lambda: load(directory))
+        timed("load_parallel (c)", lambda: load_parallel(directory, engine="c"))
+        arrow = timed("load_parallel (pyarrow)", lambda: load_parallel(directory))
+
+        print(f"speedup (pyarrow): {baseline / arrow:.1f}x")
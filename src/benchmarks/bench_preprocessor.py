@@ -0,0 +1,87 @@
+"""Micro-benchmark of DataPreprocessor normalisation against the original
+row-wise string pipeline.
+
+Run from ``src``:  python -m benchmarks.bench_preprocessor [rows]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from strategy.strategy import StationByProductStrategy
+
+
+def legacy_normalise(data: pd.DataFrame, schema: ColumnSchema) -> pd.DataFrame:
+
+    data = data.copy()
+    data[schema.product] = data[schema.product].astype(str).str.strip().str.upper()
+    data[schema.date] = pd.to_datetime(data[schema.date])
+    data[schema.sales] = (
+        data[schema.sales]
+        .astype(str)
+        .str.replace(r"[^0-9.\-]", "", regex=True)
+        .pipe(pd.to_numeric, errors="coerce")
+    )
+    return data
+
+
+def synthetic_frame(rows: int, schema: ColumnSchema, formatted: float) -> pd.DataFrame:
+
+    rng = np.random.default_rng(0)
+    volumes = rng.gamma(2.0, 500.0, size=rows).round(2).astype(str).astype(object)
+
+    # A share of the exports carry thousands separators
+    marked = rng.random(rows) < formatted
+    volumes[marked] = [f"{float(v):,.2f}" for v in volumes[marked]]
+
+    dates = pd.date_range("2023-01-01", periods=365).strftime("%Y-%m-%d")
+
+    return pd.DataFrame({
+        schema.date: rng.choice(dates, size=rows),
+        schema.station: rng.integers(1, 500, size=rows),
+        schema.product: rng.choice([" ado", "ADO", "unl ", "PRM", "Ker"], size=rows),
+        schema.sales: volumes,
+    })
+
+
+def timed(label: str, func, repeat: int = 3) -> float:
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{label:<36} {best:8.3f}s")
+    return best
+
+
+if __name__ == "__main__":
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    schema = ColumnSchema()
+    preprocessor = DataPreprocessor(schema=schema, strategy=StationByProductStrategy())
+
+    for formatted in (0.0, 0.05):
+
+        frame = synthetic_frame(rows, schema, formatted)
+        print(f"\n{rows:,} rows, {formatted:.0%} formatted volumes")
+
+        expected = legacy_normalise(frame, schema)
+        actual = preprocessor._normalise(frame.copy())
+        assert np.allclose(expected[schema.sales], actual[schema.sales], equal_nan=True)
+        assert (expected[schema.product] == actual[schema.product].astype(str)).all()
+        assert (expected[schema.date] == actual[schema.date]).all()
+
+        before = timed("legacy normalisation", lambda: legacy_normalise(frame, schema))
+        after = timed("DataPreprocessor._normalise", lambda: preprocessor._normalise(frame.copy()))
+
+        if not formatted:
+            numeric = frame.astype({schema.sales: float})
+            timed("  with already-numeric sales", lambda: preprocessor._normalise(numeric.copy()))
+
+        print(f"speedup: {before / after:.1f}x")
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.schema import ColumnSchema
+
+
+def write_sales_csvs(directory: Path,
+                     files: int = 200,
+                     rows_per_file: int = 2_000,
+                     stations: int = 50,
+                     products: tuple[str, ...] = ("ADO", "UNL", "PRM", "KER"),
+                     schema: ColumnSchema = ColumnSchema(),
+                     seed: int = 0) -> Path:
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2023-01-01")
+
+    for index in range(files):
+
+        day = start + pd.Timedelta(days=index)
+        volumes = rng.gamma(2.0, 500.0, size=rows_per_file)
+
+        # Mimic raw station exports: padded headers, mixed product casing,
+        # formatted volumes and columns the pipeline never reads
+        dataframe = pd.DataFrame({
+            f" {schema.date}": day.strftime("%Y-%m-%d"),
+            f"{schema.station} ": rng.integers(1, stations + 1, size=rows_per_file),
+            f" {schema.product} ": rng.choice(
+                [f" {p.lower()}" for p in products] + list(products), 
+                size=rows_per_file
+            ),
+            f"{schema.sales}": [f"{v:,.2f}" for v in volumes],
+            "Pump": rng.integers(1, 12, size=rows_per_file),
+            "Attendant": rng.choice(["A", "B", "C"], size=rows_per_file),
+        })
+
+        dataframe.to_csv(directory / f"sales_{index:05d}.csv", index=False)
+
+    return directory
+
+
+def daily_sales_frame(stations: int = 1_000,
+                      products: tuple[str, ...] = ("ADO", "UNL", "PRM", "KER"),
+                      days: int = 365,
+                      schema: ColumnSchema = ColumnSchema(),
+                      seed: int = 0) -> pd.DataFrame:
+
+    rng = np.random.default_rng(seed)
+
+    index = pd.MultiIndex.from_product(
+        [
+            np.arange(1, stations + 1),
+            list(products),
+            pd.date_range("2023-01-01", periods=days, freq="D"),
+        ],
+        names=[schema.station, schema.product, schema.date],
+    )
+
+    # Weekly pattern on top of noise, always positive
+    weekday = index.get_level_values(schema.date).dayofweek.to_numpy()
+    volumes = 1_000 + 150 * np.sin(2 * np.pi * weekday / 7) + rng.gamma(2.0, 100.0, len(index))
+
+    return pd.DataFrame({schema.sales: volumes}, index=index).reset_index()
@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from data.loader import filter_expression, read_table, to_pandas
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from strategy.strategy import GroupingStrategy
+from utils.cache import CacheIndex, fingerprint
+from utils.errors import DataValidationError
+
+
+@dataclass
+class SalesCache:
+    """Parquet copies of raw and preprocessed sales keyed on source files."""
+
+    directory: Path
+    schema: ColumnSchema = ColumnSchema()
+    max_bytes: Optional[int] = 2 * 1024 ** 3
+    max_workers: Optional[int] = None
+
+    index: CacheIndex = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.index = CacheIndex(Path(self.directory), max_bytes=self.max_bytes)
+
+    def file_key(self, file: Path) -> str:
+
+        stat = file.stat()
+        return fingerprint(
+            "raw", str(file.resolve()), stat.st_size, stat.st_mtime_ns, self.schema
+        )
+
+    def load(self,
+             directory: Path,
+             predicates: Optional[dict[str, Any]] = None) -> pd.DataFrame:
+
+        return to_pandas(self._load_table(self._files(directory), predicates))
+
+    def load_preprocessed(self,
+                          directory: Path,
+                          strategy: GroupingStrategy) -> pd.DataFrame:
+
+        files = self._files(directory)
+        key = fingerprint(
+            "preprocessed", [self.file_key(file) for file in files], self.schema, strategy
+        )
+
+        path = self.index.lookup(key)
+        if path is not None:
+            self.index.flush()
+            return pq.read_table(path).to_pandas()
+
+        data = DataPreprocessor(
+            schema=self.schema, strategy=strategy
+        ).preprocess(data=to_pandas(
+            self._load_table(files, strategy.get_predicates(self.schema))
+        ))
+
+        path = self.index.path(key, ".parquet")
+        pq.write_table(pa.Table.from_pandas(data, preserve_index=False), path)
+
+        self.index.record(key, path, kind="preprocessed", strategy=repr(strategy))
+        self.index.flush()
+
+        return data
+
+    def invalidate(self, file: Optional[Path] = None) -> None:
+
+        if file is None:
+            self.index.clear()
+            return
+
+        # Preprocessed entries are built from every file, so drop them too
+        source = str(Path(file).resolve())
+        self.index.discard_where(
+            lambda entry: entry.get("source") == source
+            or entry["kind"] == "preprocessed"
+        )
+        self.index.flush()
+
+    def _files(self, directory: Path) -> list[Path]:
+
+        files = sorted(Path(directory).glob("*.csv"))
+
+        if not files:
+            raise DataValidationError(f"No CSV files found in {directory}")
+
+        return files
+
+    def _load_table(self,
+                    files: list[Path],
+                    predicates: Optional[dict[str, Any]] = None) -> pa.Table:
+
+        expression = filter_expression(predicates, self.schema)
+
+        keys = [self.file_key(file) for file in files]
+        cached = [self.index.lookup(key) for key in keys]
+
+        misses = [i for i, path in enumerate(cached) if path is None]
+
+        # Only new or changed files are parsed, cached ones are read back
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            tables = list(pool.map(
+                lambda i: self._read(files[i], keys[i], cached[i], expression),
+                range(len(files))
+            ))
+
+        for i in misses:
+            source = str(files[i].resolve())
+            self.index.discard_where(lambda entry: entry.get("source") == source)
+
+            self.index.record(
+                keys[i], self.index.path(keys[i], ".parquet"), kind="raw", source=source
+            )
+
+        self.index.flush()
+
+        return pa.concat_tables(tables)
+
+    def _read(self,
+              file: Path,
+              key: str,
+              cached: Optional[Path],
+              expression: Optional[pc.Expression]) -> pa.Table:
+
+        if cached is not None:
+            return pq.read_table(cached, filters=expression)
+
+        # The cached copy stays complete so any later filter can reuse it
+        table = read_table(file, self.schema)
+        pq.write_table(table, self.index.path(key, ".parquet"))
+
+        return table if expression is None else table.filter(expression)
@@ -0,0 +1,185 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from strategy.strategy import GroupingStrategy, StationByProductStrategy
+from utils.errors import DataValidationError
+
+
+@dataclass
+class SalesCube:
+    """Dense float32 station x product x day sales backed by a memory map."""
+
+    directory: Path
+    schema: ColumnSchema
+    values: np.ndarray
+    stations: np.ndarray
+    products: np.ndarray
+    dates: pd.DatetimeIndex
+    spans: np.ndarray
+
+    @classmethod
+    def build(cls,
+              sales: pd.DataFrame,
+              directory: Path,
+              schema: ColumnSchema = ColumnSchema()) -> "SalesCube":
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        daily = DataPreprocessor(
+            schema=schema,
+            strategy=StationByProductStrategy()
+        ).preprocess(data=sales)
+
+        station_codes, stations = pd.factorize(daily[schema.station], sort=True)
+        product_codes, products = pd.factorize(daily[schema.product], sort=True)
+
+        dates = pd.date_range(
+            daily[schema.date].min(), daily[schema.date].max(), freq="D"
+        )
+        days = dates.get_indexer(daily[schema.date])
+
+        values = np.lib.format.open_memmap(
+            directory / "values.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(len(stations), len(products), len(dates)),
+        )
+        values[station_codes, product_codes, days] = daily[schema.sales].to_numpy()
+        values.flush()
+
+        # First and last observed day of every group, -1 where it never sold
+        spans = np.full((len(stations), len(products), 2), -1, dtype=np.int64)
+        bounds = (
+            pd.DataFrame({"s": station_codes, "p": product_codes, "d": days})
+            .groupby(["s", "p"])["d"]
+            .agg(["min", "max"])
+        )
+        s, p = (bounds.index.get_level_values(level).to_numpy() for level in (0, 1))
+        spans[s, p] = bounds.to_numpy()
+
+        np.save(directory / "stations.npy", np.asarray(stations, dtype=np.int64))
+        np.save(directory / "products.npy", np.asarray(products, dtype=str))
+        np.save(directory / "dates.npy", dates.to_numpy().astype("datetime64[D]"))
+        np.save(directory / "spans.npy", spans)
+
+        return cls.open(directory, schema=schema)
+
+    @classmethod
+    def open(cls,
+             directory: Path,
+             schema: ColumnSchema = ColumnSchema()) -> "SalesCube":
+
+        directory = Path(directory)
+
+        # Read-only maps are shared through the page cache across processes
+        return cls(
+            directory=directory,
+            schema=schema,
+            values=np.load(directory / "values.npy", mmap_mode="r"),
+            stations=np.load(directory / "stations.npy"),
+            products=np.load(directory / "products.npy"),
+            dates=pd.DatetimeIndex(
+                np.load(directory / "dates.npy").astype("datetime64[ns]"), freq="D"
+            ),
+            spans=np.load(directory / "spans.npy"),
+        )
+
+    def series(self,
+               station: int,
+               product: str) -> pd.Series:
+
+        return self.slice((
+            self._position(self.stations, station, "Station"),
+            self._position(self.products, product, "Product"),
+        ))
+
+    def iter_series(self,
+                    strategy: GroupingStrategy) -> Iterator[tuple[tuple, pd.Series]]:
+
+        for key, position in self.locate(strategy):
+            yield key, self.slice(position)
+
+    def locate(self, strategy: GroupingStrategy) -> list[tuple[tuple, tuple[int, ...]]]:
+        """Group keys with their cube positions, (s, p) or (p,) for product totals.
+
+        Positions are cheap to send to other processes, which reopen the cube
+        and slice it themselves.
+        """
+
+        predicates = strategy.get_predicates(self.schema)
+
+        station = predicates.get(self.schema.station)
+        product = predicates.get(self.schema.product)
+
+        products = [product] if product is not None else list(self.products)
+
+        if self.schema.station not in strategy.get_grouping_columns(self.schema):
+            return [
+                ((name,), (self._position(self.products, name, "Product"),))
+                for name in products
+            ]
+
+        stations = [station] if station is not None else list(self.stations)
+
+        located = []
+        for number in stations:
+            for name in products:
+                s = self._position(self.stations, number, "Station")
+                p = self._position(self.products, name, "Product")
+
+                if self.spans[s, p, 0] >= 0:
+                    located.append(((number, name), (s, p)))
+
+        return located
+
+    def slice(self, position: tuple[int, ...]) -> pd.Series:
+
+        if len(position) == 1:
+            return self._product_total(position[0])
+
+        s, p = position
+
+        first, last = self.spans[s, p]
+        if first < 0:
+            raise DataValidationError(
+                f"No data found for Product {self.products[p]} on Station {self.stations[s]}"
+            )
+
+        # A view into the map, no values are copied
+        return pd.Series(
+            self.values[s, p, first:last + 1],
+            index=self.dates[first:last + 1],
+            name=self.schema.sales,
+            copy=False,
+        )
+
+    def _product_total(self, p: int) -> pd.Series:
+
+        spans = self.spans[:, p]
+        spans = spans[spans[:, 0] >= 0]
+        first, last = spans[:, 0].min(), spans[:, 1].max()
+
+        return pd.Series(
+            self.values[:, p, first:last + 1].sum(axis=0, dtype=np.float64),
+            index=self.dates[first:last + 1],
+            name=self.schema.sales,
+        )
+
+    def _position(self,
+                  labels: np.ndarray,
+                  label: object,
+                  kind: str) -> int:
+
+        position = np.searchsorted(labels, label)
+
+        if position >= len(labels) or labels[position] != label:
+            raise DataValidationError(f"{kind} {label} is not in the cube")
+
+        return int(position)
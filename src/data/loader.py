@@ -1,7 +1,20 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import csv
+from functools import partial
 from pathlib import Path
+from typing import Any, Iterator, Optional
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+from data.schema import ColumnSchema
+from utils.errors import DataValidationError
+from utils.instrumentation import traced
 
 
+@traced("load")
 def load(directory: Path):
 
     dataset = []
@@ -13,3 +26,204 @@ def load(directory: Path):
         dataset.append(dataframe)
 
     return pd.concat(dataset, ignore_index=True)
+
+
+@traced("load")
+def load_parallel(directory: Path,
+                  schema: ColumnSchema = ColumnSchema(),
+                  engine: str = "pyarrow",
+                  max_workers: Optional[int] = None,
+                  processes: bool = False,
+                  predicates: Optional[dict[str, Any]] = None) -> pd.DataFrame:
+
+    files = sorted(Path(directory).glob("*.csv"))
+
+    if not files:
+        raise DataValidationError(f"No CSV files found in {directory}")
+
+    if engine == "pyarrow":
+        reader = partial(read_table, schema=schema, predicates=predicates)
+    elif engine == "c":
+        reader = partial(_read_pandas, schema=schema, predicates=predicates)
+    else:
+        raise ValueError(f"Unknown CSV engine '{engine}'")
+
+    pool: Executor = (
+        ProcessPoolExecutor(max_workers=max_workers)
+        if processes else ThreadPoolExecutor(max_workers=max_workers)
+    )
+
+    with pool:
+        pieces = list(pool.map(reader, files))
+
+    # Arrow pieces are stitched without copying and converted once
+    if engine == "pyarrow":
+        return to_pandas(pa.concat_tables(pieces))
+
+    return pd.concat(pieces, ignore_index=True)
+
+
+def iter_chunks(directory: Path,
+                schema: ColumnSchema = ColumnSchema(),
+                block_size: int = 16 * 1024 ** 2,
+                predicates: Optional[dict[str, Any]] = None) -> Iterator[pd.DataFrame]:
+
+    files = sorted(Path(directory).glob("*.csv"))
+
+    if not files:
+        raise DataValidationError(f"No CSV files found in {directory}")
+
+    expression = filter_expression(predicates, schema)
+
+    for file in files:
+
+        projection = _projection(file, schema)
+
+        reader = pv.open_csv(
+            file,
+            read_options=pv.ReadOptions(block_size=block_size),
+            convert_options=_convert_options(projection, schema),
+        )
+
+        # Each block of the file is handed over before the next one is read
+        for batch in reader:
+            table = _select(pa.Table.from_batches([batch]), projection, schema)
+
+            if expression is not None:
+                table = table.filter(expression)
+
+            yield to_pandas(table)
+
+
+def read_table(file: Path,
+               schema: ColumnSchema,
+               predicates: Optional[dict[str, Any]] = None) -> pa.Table:
+
+    projection = _projection(file, schema)
+
+    table = pv.read_csv(
+        file,
+        read_options=pv.ReadOptions(use_threads=False),
+        convert_options=_convert_options(projection, schema),
+    )
+
+    table = _select(table, projection, schema)
+    expression = filter_expression(predicates, schema)
+
+    return table if expression is None else table.filter(expression)
+
+
+def filter_expression(predicates: Optional[dict[str, Any]],
+                      schema: ColumnSchema) -> Optional[pc.Expression]:
+
+    expression = None
+
+    for column, value in (predicates or {}).items():
+
+        # Raw product names are compared in their standardized form
+        field = pc.field(column)
+        if column == schema.product:
+            field = pc.utf8_upper(pc.utf8_trim_whitespace(field))
+
+        term = field == value
+        expression = term if expression is None else expression & term
+
+    return expression
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+
+    # Keep integer columns nullable so both engines agree on dtypes
+    return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+
+def _read_header(file: Path) -> list[str]:
+
+    with open(file, newline="", encoding="utf-8-sig") as handle:
+        return next(csv.reader(handle), [])
+
+
+def _projection(file: Path,
+                schema: ColumnSchema) -> dict[str, str]:
+
+    # Raw exports pad their headers, so map raw names to schema names
+    wanted = set(schema.columns)
+    projection = {
+        raw: raw.strip() for raw in _read_header(file)
+        if raw.strip() in wanted
+    }
+
+    missing = wanted - set(projection.values())
+    if missing:
+        raise DataValidationError(
+            f"File '{file.name}' is missing columns {sorted(missing)}"
+        )
+
+    return projection
+
+
+def _arrow_types(schema: ColumnSchema) -> dict[str, pa.DataType]:
+
+    # Sales stay as text: exports may hold formatted volumes ("1,234.50"),
+    # which DataPreprocessor cleans
+    return {
+        schema.date: pa.string(),
+        schema.station: pa.int64(),
+        schema.product: pa.string(),
+        schema.sales: pa.string(),
+    }
+
+
+def _convert_options(projection: dict[str, str],
+                     schema: ColumnSchema) -> pv.ConvertOptions:
+
+    types = _arrow_types(schema)
+
+    return pv.ConvertOptions(
+        include_columns=list(projection),
+        column_types={raw: types[name] for raw, name in projection.items()},
+    )
+
+
+def _select(table: pa.Table,
+            projection: dict[str, str],
+            schema: ColumnSchema) -> pa.Table:
+
+    table = table.rename_columns([projection[name] for name in table.column_names])
+    return table.select(schema.columns)
+
+
+def _pandas_types(schema: ColumnSchema) -> dict[str, str]:
+
+    return {
+        schema.date: "str",
+        schema.station: "Int64",
+        schema.product: "str",
+        schema.sales: "str",
+    }
+
+
+def _read_pandas(file: Path,
+                 schema: ColumnSchema,
+                 predicates: Optional[dict[str, Any]] = None) -> pd.DataFrame:
+
+    projection = _projection(file, schema)
+    types = _pandas_types(schema)
+
+    dataframe = pd.read_csv(
+        file,
+        usecols=list(projection),
+        dtype={raw: types[name] for raw, name in projection.items()},
+    )
+
+    dataframe = dataframe.rename(columns=projection)[schema.columns]
+
+    for column, value in (predicates or {}).items():
+
+        values = dataframe[column]
+        if column == schema.product:
+            values = values.str.strip().str.upper()
+
+        dataframe = dataframe[values == value]
+
+    return dataframe
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
+from typing import Iterable, Optional
 import pandas as pd
 
 from data.schema import ColumnSchema
 from strategy.strategy import GroupingStrategy
 from utils.errors import DataValidationError
+from utils.instrumentation import traced
 
 
 @dataclass
@@ -11,48 +13,131 @@ class DataPreprocessor:
 
     schema: ColumnSchema
     strategy: GroupingStrategy
-    
-    def preprocess(self, 
+    date_format: Optional[str] = None
+    compact_every: int = 32
+
+    @traced("preprocess")
+    def preprocess(self,
                    data: pd.DataFrame):
 
         data = data.copy()
+        data = self._normalise(data)
+
+        # Apply strategy filtering
+        data = self.strategy.filter_data(data, self.schema)
+
+        return self._finalise(self._aggregate(data))
+
+    def preprocess_chunks(self,
+                          chunks: Iterable[pd.DataFrame]):
+
+        partials: list[pd.DataFrame] = []
+        error: Optional[DataValidationError] = None
+
+        for chunk in chunks:
+
+            chunk = self._normalise(chunk)
+
+            # A chunk without matching rows is expected, not an error
+            try:
+                chunk = self.strategy.filter_data(chunk, self.schema)
+            except DataValidationError as e:
+                error = e
+                continue
+
+            partials.append(self._aggregate(chunk))
+
+            # Merge partial sums so memory tracks the aggregated output
+            if len(partials) >= self.compact_every:
+                partials = [self._aggregate(pd.concat(partials, ignore_index=True))]
+
+        if not partials:
+            raise error or DataValidationError("No data to preprocess")
+
+        return self._finalise(
+            self._aggregate(pd.concat(partials, ignore_index=True))
+        )
+
+    def _normalise(self,
+                   data: pd.DataFrame) -> pd.DataFrame:
+
+        data[self.schema.product] = self._normalise_products(data[self.schema.product])
+        data[self.schema.date] = self._parse_dates(data[self.schema.date])
+        data[self.schema.sales] = self._clean_sales(data[self.schema.sales])
+
+        return data
+
+    def _normalise_products(self,
+                            products: pd.Series) -> pd.Series:
+
+        # Standardize each distinct name once, then map back through the codes
+        codes, uniques = pd.factorize(products, use_na_sentinel=False)
+        names = pd.Index(uniques).astype(str).str.strip().str.upper()
 
-        # Standardadize Product Names
-        data[self.schema.product] = (
-            data[self.schema.product]
-            .astype(str)
-            .str.strip()
-            .str.upper()
+        name_codes, categories = pd.factorize(names, sort=True)
+
+        return pd.Series(
+            pd.Categorical.from_codes(name_codes[codes], categories=categories),
+            index=products.index,
         )
 
-        # Parse Dates
+    def _parse_dates(self,
+                     dates: pd.Series) -> pd.Series:
+
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+
+        # Exports repeat a handful of days, so parse each distinct value once
         try:
-            data[self.schema.date] = pd.to_datetime(data[self.schema.date])
+            codes, uniques = pd.factorize(dates, use_na_sentinel=False)
+            parsed = pd.to_datetime(pd.Index(uniques), format=self.date_format)
         except Exception as e:
             raise DataValidationError(
                 f"Failed to parse date column '{self.schema.date}': {e}"
             )
-        
-        # Ensure Numeric Sales
-        data[self.schema.sales] = (
-            data[self.schema.sales]
-            .astype(str)
-            .str.replace(r"[^0-9.\-]", "", regex=True)
-            .pipe(pd.to_numeric, errors="coerce")
-        )
 
-        # Apply strategy filtering
-        data = self.strategy.filter_data(data, self.schema)
+        return pd.Series(parsed[codes], index=dates.index)
+
+    def _clean_sales(self,
+                     sales: pd.Series) -> pd.Series:
+
+        if pd.api.types.is_numeric_dtype(sales):
+            return sales
+
+        text = sales.astype(str)
+
+        # Values made only of digits, points and signs parse as they are,
+        # anything else ("1e5", "inf", "1,200 L") needs the character clean-up
+        plain = text.str.fullmatch(r"[0-9.\-]*")
+        numbers = pd.to_numeric(text.where(plain), errors="coerce")
+
+        if not plain.all():
+            numbers[~plain] = (
+                text[~plain]
+                .str.replace(r"[^0-9.\-]", "", regex=True)
+                .pipe(pd.to_numeric, errors="coerce")
+            )
+
+        return numbers
+
+    def _aggregate(self,
+                   data: pd.DataFrame) -> pd.DataFrame:
 
         group_columns = self.strategy.get_grouping_columns(self.schema)
 
-        data = (
+        return (
             data
-            .groupby(group_columns, as_index=False)
+            .groupby(group_columns, as_index=False, observed=True)
             .agg({self.schema.sales: "sum"})
-            .dropna(subset=[self.schema.sales])
-            .sort_values(by=self.schema.date)
         )
 
+    def _finalise(self,
+                  data: pd.DataFrame) -> pd.DataFrame:
 
-        return data
+        # Products leave as plain strings, as downstream groupbys expect
+        return (
+            data
+            .dropna(subset=[self.schema.sales])
+            .sort_values(by=self.schema.date)
+            .astype({self.schema.product: str})
+        )
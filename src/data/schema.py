@@ -7,3 +7,7 @@ class ColumnSchema:
     sales: str = "Sales Vol"
     product: str = "Product"
     station: str = "Station #"
+
+    @property
+    def columns(self) -> list[str]:
+        return [self.date, self.station, self.product, self.sales]
@@ -0,0 +1,151 @@
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from typing import Any, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from strategy.strategy import GroupingStrategy, StationByProductStrategy
+from utils.errors import DataValidationError
+
+
+@dataclass
+class PartitionedStore:
+    """Daily station/product sales kept as one Parquet file per group."""
+
+    directory: Path
+    schema: ColumnSchema = ColumnSchema()
+
+    partitions: dict[str, dict[str, Any]] = field(init=False)
+
+    def __post_init__(self) -> None:
+
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.partitions = (
+            json.loads(self.manifest.read_text())
+            if self.manifest.exists() else {}
+        )
+
+    @property
+    def manifest(self) -> Path:
+        return self.directory / "manifest.json"
+
+    def write(self, sales: pd.DataFrame) -> None:
+
+        # Store the finest grain so every strategy can be served from it
+        daily = DataPreprocessor(
+            schema=self.schema,
+            strategy=StationByProductStrategy()
+        ).preprocess(data=sales)
+
+        for (station, product), group in daily.groupby(
+            [self.schema.station, self.schema.product]
+        ):
+
+            path = Path(f"station={station}") / f"{_safe_name(product)}.parquet"
+            (self.directory / path).parent.mkdir(parents=True, exist_ok=True)
+
+            pq.write_table(
+                pa.Table.from_pandas(group, preserve_index=False),
+                self.directory / path
+            )
+
+            self.partitions[_partition_key(station, product)] = {
+                "station": int(station),
+                "product": product,
+                "file": path.as_posix(),
+                "rows": len(group),
+                "start": group[self.schema.date].min().isoformat(),
+                "end": group[self.schema.date].max().isoformat(),
+            }
+
+        self.manifest.write_text(json.dumps(self.partitions, indent=2))
+
+    def select(self, strategy: GroupingStrategy) -> list[dict[str, Any]]:
+
+        predicates = strategy.get_predicates(self.schema)
+
+        station = predicates.get(self.schema.station)
+        product = predicates.get(self.schema.product)
+
+        # A fully specified group is a direct manifest lookup
+        if station is not None and product is not None:
+            entry = self.partitions.get(_partition_key(station, product))
+            return [entry] if entry is not None else []
+
+        return [
+            entry for entry in self.partitions.values()
+            if (station is None or entry["station"] == station)
+            and (product is None or entry["product"] == product)
+        ]
+
+    def load(self, strategy: GroupingStrategy) -> pd.DataFrame:
+
+        entries = self.select(strategy)
+
+        if not entries:
+            raise DataValidationError(
+                f"No stored partitions match {strategy}"
+            )
+
+        return pd.concat(
+            [self._read(entry) for entry in entries],
+            ignore_index=True
+        )
+
+    def group_entries(self,
+                      strategy: GroupingStrategy) -> dict[tuple, list[dict[str, Any]]]:
+        """Matching partitions keyed by the strategy's groups.
+
+        Keys are ``(station, product)``, or ``(product,)`` when the strategy
+        does not group by station and each product spans several files.
+        """
+
+        by_station = self.schema.station in strategy.get_grouping_columns(self.schema)
+
+        groups: dict[tuple, list[dict[str, Any]]] = {}
+        for entry in self.select(strategy):
+            key = (entry["station"], entry["product"]) if by_station else (entry["product"],)
+            groups.setdefault(key, []).append(entry)
+
+        return dict(sorted(groups.items()))
+
+    def read_group(self,
+                   strategy: GroupingStrategy,
+                   entries: list[dict[str, Any]]) -> pd.DataFrame:
+
+        group = pd.concat([self._read(entry) for entry in entries], ignore_index=True)
+
+        if len(entries) == 1:
+            return group
+
+        # Stations of a product group add up by date
+        return (
+            group
+            .groupby(strategy.get_grouping_columns(self.schema), as_index=False, observed=True)
+            .agg({self.schema.sales: "sum"})
+            .sort_values(by=self.schema.date)
+        )
+
+    def iter_groups(self,
+                    strategy: GroupingStrategy) -> Iterator[tuple[tuple, pd.DataFrame]]:
+
+        for key, entries in self.group_entries(strategy).items():
+            yield key, self.read_group(strategy, entries)
+
+    def _read(self, entry: dict[str, Any]) -> pd.DataFrame:
+        return pq.read_table(self.directory / entry["file"]).to_pandas()
+
+
+def _partition_key(station: Any, product: str) -> str:
+    return f"{int(station)}|{product}"
+
+
+def _safe_name(name: str) -> str:
+    return name.replace(' ', '_').replace('/', '-')
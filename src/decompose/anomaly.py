@@ -0,0 +1,289 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from strategy.strategy import GroupingStrategy
+
+
+# Last scored day of a group that has none yet
+_NEVER = np.iinfo(np.int64).min
+
+
+@dataclass
+class LowSalesDetector:
+    """Running per-group sales statistics that flag unusually low days as they arrive.
+
+    Each day is scored against the mean and standard deviation of the days
+    before it, then folded in with a Welford update, so scoring is O(1) per
+    group. ``window`` keeps only the most recent days and ``seasonal_period``
+    keeps separate statistics per weekday (or other phase). Every group/day
+    is folded in once: days at or before a group's last scored day are
+    skipped.
+    """
+
+    schema: ColumnSchema = ColumnSchema()
+    multiplier: float = 2.0
+    minimum_count: int = 14
+    window: Optional[int] = None
+    seasonal_period: Optional[int] = None
+
+    keys: list[str] = field(default_factory=list, init=False)
+    count: np.ndarray = field(init=False)
+    mean: np.ndarray = field(init=False)
+    m2: np.ndarray = field(init=False)
+    total: np.ndarray = field(init=False)
+    buffer: np.ndarray = field(init=False)
+    last_date: np.ndarray = field(init=False)
+
+    _positions: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+
+        phases = self.seasonal_period or 1
+
+        self.count = np.zeros((0, phases), dtype=np.int64)
+        self.mean = np.zeros((0, phases))
+        self.m2 = np.zeros((0, phases))
+        self.total = np.zeros((0, phases), dtype=np.int64)
+        self.buffer = np.zeros((0, phases, self.window or 0))
+        self.last_date = np.zeros(0, dtype=np.int64)
+
+    def ingest(self,
+               sales: pd.DataFrame,
+               strategy: GroupingStrategy) -> pd.DataFrame:
+        """Preprocesses raw sales and scores every group/day in date order."""
+
+        daily = DataPreprocessor(
+            schema=self.schema, strategy=strategy
+        ).preprocess(data=sales.copy())
+
+        group_cols = [
+            col for col in strategy.get_grouping_columns(schema=self.schema)
+            if col != self.schema.date
+        ]
+        keys = daily[group_cols].astype(str).agg("|".join, axis=1).to_numpy()
+        days = _days(daily[self.schema.date])
+
+        if not len(days):
+            return self.score(keys, daily[self.schema.date], daily[self.schema.sales])
+
+        # Days without sales are missing from the aggregate, so lay every
+        # group out daily from the day after it was last scored
+        groups, inverse = np.unique(keys, return_inverse=True)
+        first = np.full(len(groups), days.max())
+        np.minimum.at(first, inverse, days)
+
+        positions = self._register(groups)
+        last = self.last_date[positions]
+        start = np.where(last == _NEVER, first, last + 1)
+        lengths = np.maximum(days.max() - start + 1, 0)
+
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        grid = pd.MultiIndex.from_arrays([
+            np.repeat(groups, lengths),
+            np.repeat(start, lengths) + offsets,
+        ])
+
+        observed = pd.Series(
+            daily[self.schema.sales].to_numpy(dtype=float),
+            index=pd.MultiIndex.from_arrays([keys, days])
+        )
+        filled = observed.reindex(grid, fill_value=0.0)
+
+        return self.score(
+            grid.get_level_values(0).to_numpy(),
+            pd.Series(grid.get_level_values(1).to_numpy().astype("datetime64[D]")),
+            filled
+        )
+
+    def score(self,
+              keys: np.ndarray,
+              dates: pd.Series,
+              values: pd.Series) -> pd.DataFrame:
+
+        keys = np.asarray(keys, dtype=str)
+        dates = pd.DatetimeIndex(dates)
+        values = np.asarray(values, dtype=float)
+
+        rows = self._register(keys)
+        days = _days(dates)
+
+        # A repeated or already scored group/day would be counted twice
+        fresh = (days > self.last_date[rows]) & ~pd.DataFrame(
+            {"row": rows, "day": days}
+        ).duplicated(keep="last").to_numpy()
+
+        if not fresh.all():
+            print(f"Skipping {(~fresh).sum()} group days already scored")
+            keys, dates, values = keys[fresh], dates[fresh], values[fresh]
+            rows, days = rows[fresh], days[fresh]
+
+        phases = self._phase(days)
+
+        seen = np.zeros(len(values), dtype=np.int64)
+        mean = np.full(len(values), np.nan)
+        std = np.full(len(values), np.nan)
+
+        # A group seen several times in one batch is applied day by day
+        order = np.lexsort((days, rows))
+        rank = pd.Series(rows[order]).groupby(rows[order]).cumcount().to_numpy()
+
+        for step in range(rank.max() + 1 if len(rank) else 0):
+
+            at = order[rank == step]
+            r, p, x = rows[at], phases[at], values[at]
+
+            # Score against the days before, then fold the new day in
+            n = self.count[r, p]
+            seen[at] = n
+            mean[at] = np.where(n > 0, self.mean[r, p], np.nan)
+            std[at] = np.where(n > 1, np.sqrt(self.m2[r, p] / np.maximum(n - 1, 1)), np.nan)
+
+            if self.window:
+                self._forget(r, p)
+
+            self._add(r, p, x)
+
+        np.maximum.at(self.last_date, rows, days)
+
+        threshold = mean - self.multiplier * std
+        enough = seen >= self.minimum_count
+
+        return pd.DataFrame({
+            "Group": keys,
+            self.schema.date: dates,
+            self.schema.sales: values,
+            "Mean": mean,
+            "Std": std,
+            "Low Threshold": threshold,
+            "Is Unusually Low": enough & (values < threshold),
+        })
+
+    def save(self, path: Path) -> None:
+
+        np.savez_compressed(
+            _state_path(path),
+            keys=np.asarray(self.keys, dtype=str),
+            count=self.count,
+            mean=self.mean,
+            m2=self.m2,
+            total=self.total,
+            buffer=self.buffer,
+            last_date=self.last_date,
+            settings=np.array([
+                self.multiplier,
+                self.minimum_count,
+                self.window or 0,
+                self.seasonal_period or 0
+            ], dtype=float),
+        )
+
+    @classmethod
+    def load(cls,
+             path: Path,
+             schema: ColumnSchema = ColumnSchema()) -> "LowSalesDetector":
+
+        with np.load(_state_path(path)) as state:
+
+            multiplier, minimum_count, window, seasonal_period = state["settings"]
+
+            detector = cls(
+                schema=schema,
+                multiplier=float(multiplier),
+                minimum_count=int(minimum_count),
+                window=int(window) or None,
+                seasonal_period=int(seasonal_period) or None,
+            )
+
+            detector.keys = state["keys"].tolist()
+            detector.count = state["count"]
+            detector.mean = state["mean"]
+            detector.m2 = state["m2"]
+            detector.total = state["total"]
+            detector.buffer = state["buffer"]
+            detector.last_date = state["last_date"]
+
+        detector._positions = {key: i for i, key in enumerate(detector.keys)}
+        return detector
+
+    def _register(self, keys: np.ndarray) -> np.ndarray:
+
+        new = [key for key in dict.fromkeys(keys.tolist()) if key not in self._positions]
+
+        if new:
+            for key in new:
+                self._positions[key] = len(self.keys)
+                self.keys.append(key)
+
+            grow = len(new)
+            self.count = np.pad(self.count, ((0, grow), (0, 0)))
+            self.mean = np.pad(self.mean, ((0, grow), (0, 0)))
+            self.m2 = np.pad(self.m2, ((0, grow), (0, 0)))
+            self.total = np.pad(self.total, ((0, grow), (0, 0)))
+            self.buffer = np.pad(self.buffer, ((0, grow), (0, 0), (0, 0)))
+            self.last_date = np.pad(self.last_date, (0, grow), constant_values=_NEVER)
+
+        return np.array([self._positions[key] for key in keys.tolist()], dtype=np.int64)
+
+    def _phase(self, days: np.ndarray) -> np.ndarray:
+
+        if not self.seasonal_period:
+            return np.zeros(len(days), dtype=np.int64)
+
+        return days % self.seasonal_period
+
+    def _add(self,
+             rows: np.ndarray,
+             phases: np.ndarray,
+             values: np.ndarray) -> None:
+
+        if self.window:
+            # The ring buffer slot for the n-th value ever seen is n mod window
+            self.buffer[rows, phases, self.total[rows, phases] % self.window] = values
+
+        self.total[rows, phases] += 1
+
+        n = self.count[rows, phases] + 1
+        delta = values - self.mean[rows, phases]
+
+        self.mean[rows, phases] += delta / n
+        self.m2[rows, phases] += delta * (values - self.mean[rows, phases])
+        self.count[rows, phases] = n
+
+    def _forget(self,
+                rows: np.ndarray,
+                phases: np.ndarray) -> None:
+
+        # Once the window is full, remove the value about to be overwritten
+        full = self.count[rows, phases] >= self.window
+        if not full.any():
+            return
+
+        r, p = rows[full], phases[full]
+        n = self.count[r, p]
+        oldest = self.buffer[r, p, self.total[r, p] % self.window]
+
+        mean = self.mean[r, p]
+        reduced = np.where(n > 1, mean - (oldest - mean) / np.maximum(n - 1, 1), 0.0)
+
+        self.m2[r, p] = np.maximum(self.m2[r, p] - (oldest - mean) * (oldest - reduced), 0.0)
+        self.mean[r, p] = reduced
+        self.count[r, p] = n - 1
+
+
+def _days(dates: pd.Series | pd.DatetimeIndex) -> np.ndarray:
+
+    # Whole days since the epoch, whatever the datetime resolution
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+def _state_path(path: Path) -> Path:
+
+    # numpy appends .npz when saving, so loading has to match
+    path = Path(path)
+    return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
@@ -1,12 +1,22 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 from statsmodels.tsa.seasonal import seasonal_decompose
 
+from data.cube import SalesCube
 from data.preprocessor import DataPreprocessor
 from data.schema import ColumnSchema
+from data.store import PartitionedStore
 from strategy.strategy import GroupingStrategy
+from utils.instrumentation import TRACER, run_traced, traced
 
 
 @dataclass(frozen=True)
@@ -16,7 +26,10 @@ class DecompositionConfig:
     seasonal_period: int = 7
     model_type: str = "additive"
     frequency: str = "D"
-    low_sales_std_multiplier = 2.0
+    low_sales_std_multiplier: float = 2.0
+    workers: int = 1
+    batch_size: int = 64
+    batched: bool = False
 
 
 @dataclass(frozen=True)
@@ -58,6 +71,81 @@ class DecompositionResult:
         })
 
 
+@dataclass(frozen=True)
+class BatchDecomposition:
+
+    observed: np.ndarray
+    trend: np.ndarray
+    seasonal: np.ndarray
+    residual: np.ndarray
+
+
+def batch_seasonal_decompose(values: np.ndarray,
+                             period: int,
+                             model: str = "additive") -> BatchDecomposition:
+    """Moving-average decomposition of equal-length series stacked as rows.
+
+    Mirrors ``statsmodels.tsa.seasonal.seasonal_decompose`` for each row.
+    """
+
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[np.newaxis, :]
+
+    multiplicative = model in ("multiplicative", "mul")
+    nobs = values.shape[1]
+
+    if not np.all(np.isfinite(values)):
+        raise ValueError("This function does not handle missing values")
+
+    if multiplicative and np.any(values <= 0):
+        raise ValueError(
+            "Multiplicative seasonality is not appropriate "
+            "for zero and negative values"
+        )
+
+    if nobs < 2 * period:
+        raise ValueError(
+            f"x must have 2 complete cycles requires {2 * period} "
+            f"observations. x only has {nobs} observation(s)"
+        )
+
+    # Centred moving average, split weights at the ends for even periods
+    if period % 2 == 0:
+        weights = np.array([0.5] + [1.0] * (period - 1) + [0.5]) / period
+    else:
+        weights = np.repeat(1.0 / period, period)
+
+    half = len(weights) // 2
+
+    trend = np.full_like(values, np.nan)
+    trend[:, half:nobs - half] = sliding_window_view(values, len(weights), axis=1) @ weights
+
+    detrended = values / trend if multiplicative else values - trend
+
+    # Fold into whole cycles so each phase is one column
+    cycles = -(-nobs // period)
+    folded = np.full((values.shape[0], cycles * period), np.nan)
+    folded[:, :nobs] = detrended
+
+    averages = np.nanmean(folded.reshape(values.shape[0], cycles, period), axis=1)
+
+    if multiplicative:
+        averages /= averages.mean(axis=1, keepdims=True)
+    else:
+        averages -= averages.mean(axis=1, keepdims=True)
+
+    seasonal = np.tile(averages, cycles)[:, :nobs]
+    residual = values / seasonal / trend if multiplicative else detrended - seasonal
+
+    return BatchDecomposition(
+        observed=values,
+        trend=trend,
+        seasonal=seasonal,
+        residual=residual,
+    )
+
+
 @dataclass
 class Decomposer:
 
@@ -65,8 +153,38 @@ class Decomposer:
     strategy: GroupingStrategy
     config: DecompositionConfig
 
+    @traced("decompose")
     def decompose(self, sales: pd.DataFrame):
 
+        return self._combine(self._run(self._frame_sources(sales), as_frame=True))
+
+    @traced("decompose")
+    def decompose_cube(self, cube: SalesCube):
+
+        return self._combine(self._run(self._cube_sources(cube), as_frame=True))
+
+    @traced("decompose")
+    def decompose_store(self, store: PartitionedStore):
+
+        return self._combine(self._run(self._store_sources(store), as_frame=True))
+
+    def iter_decompose(self, sales: pd.DataFrame) -> Iterator[DecompositionResult]:
+
+        for _, results in self._run(self._frame_sources(sales), as_frame=False):
+            yield from results
+
+    def iter_decompose_cube(self, cube: SalesCube) -> Iterator[DecompositionResult]:
+
+        for _, results in self._run(self._cube_sources(cube), as_frame=False):
+            yield from results
+
+    def iter_decompose_store(self, store: PartitionedStore) -> Iterator[DecompositionResult]:
+
+        for _, results in self._run(self._store_sources(store), as_frame=False):
+            yield from results
+
+    def _frame_sources(self, sales: pd.DataFrame) -> Iterator[Callable[[], Iterator]]:
+
         sales = sales.copy()
         sales = DataPreprocessor(
             schema=self.schema, 
@@ -76,7 +194,61 @@ class Decomposer:
         group_cols = self.strategy.get_grouping_columns(schema=self.schema)
         group_by_cols = [col for col in group_cols if col != self.schema.date]
 
-        results: list[DecompositionResult] = []
+        # Lay groups out contiguously so each batch is one slice of rows
+        codes = sales.groupby(group_by_cols, observed=True).ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        sales, codes = sales.iloc[order], codes[order]
+
+        starts = np.searchsorted(
+            codes, np.arange(0, codes.max() + 1 if len(codes) else 0, self.config.batch_size)
+        )
+
+        for start, end in zip(starts, [*starts[1:], len(codes)]):
+            yield partial(self._iter_groups, sales.iloc[start:end])
+
+    def _cube_sources(self, cube: SalesCube) -> Iterator[Callable[[], Iterator]]:
+
+        # Only positions travel, each worker maps the cube itself and shares
+        # its pages with the others through the page cache
+        for batch in _batched(cube.locate(self.strategy), self.config.batch_size):
+            yield partial(self._iter_cube, cube.directory, batch)
+
+    def _iter_cube(self,
+                   directory: Path,
+                   batch: list[tuple[tuple, tuple[int, ...]]]) -> Iterator[tuple[tuple, pd.Series]]:
+
+        cube = SalesCube.open(directory, schema=self.schema)
+
+        # Cube slices are already daily and zero-filled, so they go straight in
+        for group_key, position in batch:
+            yield group_key, cube.slice(position)
+
+    def _store_sources(self, store: PartitionedStore) -> Iterator[Callable[[], Iterator]]:
+
+        # Only manifest entries travel, each worker reads its own files
+        groups = store.group_entries(self.strategy).items()
+
+        for batch in _batched(groups, self.config.batch_size):
+            yield partial(self._iter_store, store.directory, batch)
+
+    def _iter_store(self,
+                    directory: Path,
+                    batch: list[tuple[tuple, list[dict[str, Any]]]]) -> Iterator[tuple[tuple, pd.Series]]:
+
+        store = PartitionedStore(directory, schema=self.schema)
+
+        for group_key, entries in batch:
+
+            # Prepare Time Series
+            group = store.read_group(self.strategy, entries).set_index(self.schema.date)
+            group = group[[self.schema.sales]].asfreq(self.config.frequency).fillna(0)
+
+            yield group_key, group[self.schema.sales]
+
+    def _iter_groups(self, sales: pd.DataFrame) -> Iterator[tuple[tuple, pd.Series]]:
+
+        group_cols = self.strategy.get_grouping_columns(schema=self.schema)
+        group_by_cols = [col for col in group_cols if col != self.schema.date]
 
         for group_key, group in sales.groupby(group_by_cols):
 
@@ -84,46 +256,175 @@ class Decomposer:
             group = group.set_index(self.schema.date)
             group = group.asfreq(self.config.frequency).fillna(0)
 
-            # Perform Decomposition
-            decomposition = seasonal_decompose(
-                group[self.schema.sales], 
-                model=self.config.model_type, 
-                period=self.config.seasonal_period
+            yield group_key, group[self.schema.sales]
+
+    def _run(self,
+             sources: Iterable[Callable[[], Iterator]],
+             as_frame: bool) -> Iterator[tuple[int, Any]]:
+
+        if self.config.workers <= 1:
+            for source in sources:
+                yield self._decompose_source(source, as_frame)
+            return
+
+        # Keep a bounded number of batches in flight and yield them in order
+        with ProcessPoolExecutor(max_workers=self.config.workers) as pool:
+
+            pending: deque[Future] = deque()
+
+            for source in sources:
+                pending.append(pool.submit(
+                    run_traced, TRACER.settings(), self._decompose_source, source, as_frame
+                ))
+
+                if len(pending) >= 2 * self.config.workers:
+                    yield _absorbed(pending.popleft())
+
+            while pending:
+                yield _absorbed(pending.popleft())
+
+    @traced("decompose_batch")
+    def _decompose_source(self,
+                          source: Callable[[], Iterator],
+                          as_frame: bool) -> tuple[int, Any]:
+
+        # Group preparation, decomposition and frame building all run here,
+        # so only one batch of rows goes in and one frame comes back
+        groups = list(source())
+
+        decompose = self._decompose_stacked if self.config.batched else self._decompose_batch
+        results = decompose(groups)
+
+        if not as_frame:
+            return len(results), results
+
+        return len(results), (
+            pd.concat([result.to_dataframe() for result in results], ignore_index=False)
+            if results else None
+        )
+
+    def _decompose_batch(self,
+                         groups: list[tuple[tuple, pd.Series]]) -> list[DecompositionResult]:
+
+        return [self._decompose_group(group_key, sales) for group_key, sales in groups]
+
+    def _decompose_group(self,
+                         group_key: tuple,
+                         sales: pd.Series) -> DecompositionResult:
+
+        # Perform Decomposition
+        decomposition = seasonal_decompose(
+            sales, 
+            model=self.config.model_type, 
+            period=self.config.seasonal_period
+        )
+
+        return self._result(
+            group_key=group_key,
+            sales=sales,
+            trend=decomposition.trend,
+            seasonal=decomposition.seasonal,
+            residual=decomposition.resid,
+            mean_sales=sales.mean(),
+            std_sales=sales.std(),
+        )
+
+    def _decompose_stacked(self,
+                           groups: list[tuple[tuple, pd.Series]]) -> list[DecompositionResult]:
+
+        results: list[DecompositionResult | None] = [None] * len(groups)
+
+        # Series of equal length share one array pass
+        lengths: dict[int, list[int]] = {}
+        for position, (_, sales) in enumerate(groups):
+            lengths.setdefault(len(sales), []).append(position)
+
+        for positions in lengths.values():
+
+            values = np.stack([groups[i][1].to_numpy(dtype=float) for i in positions])
+
+            decomposition = batch_seasonal_decompose(
+                values, 
+                period=self.config.seasonal_period, 
+                model=self.config.model_type
             )
-    
-            # Compute Statistics
-            mean_sales = group[self.schema.sales].mean()
-            std_sales = group[self.schema.sales].std()
-            cv_sales = std_sales / mean_sales if mean_sales != 0 else float('nan')
-
-            # Identify unusually low days (below mean - 2*std)
-            low_sales_threshold = mean_sales - 2 * std_sales
-            unusually_low = group["Sales Vol"] < low_sales_threshold
-
-            # Get group identifier
-            group_id = self.strategy.get_group_identifier(group_key)
-
-            results.append(
-                DecompositionResult(
-                    group_id=group_id,
-                    dates=pd.DatetimeIndex(group.index),
-                    observed=decomposition.observed,
-                    trend=decomposition.trend,
-                    seasonal=decomposition.seasonal,
-                    residual=decomposition.resid,
-                    statistics=SalesStatistics(
-                        mean=mean_sales,
-                        std=std_sales,
-                        coefficient_of_variation=cv_sales,
-                        low_threshold=low_sales_threshold,
-                    ),
-                    unusually_low=unusually_low,
+
+            means = values.mean(axis=1)
+            stds = values.std(axis=1, ddof=1)
+
+            for row, i in enumerate(positions):
+                group_key, sales = groups[i]
+
+                results[i] = self._result(
+                    group_key=group_key,
+                    sales=sales,
+                    trend=pd.Series(decomposition.trend[row], index=sales.index, name="trend"),
+                    seasonal=pd.Series(decomposition.seasonal[row], index=sales.index, name="seasonal"),
+                    residual=pd.Series(decomposition.residual[row], index=sales.index, name="resid"),
+                    mean_sales=means[row],
+                    std_sales=stds[row],
                 )
-            )
 
-        print(f"Processed {len(results)} groups successfully. Starting to save...")
+        return results
+
+    def _result(self,
+                group_key: tuple,
+                sales: pd.Series,
+                trend: pd.Series,
+                seasonal: pd.Series,
+                residual: pd.Series,
+                mean_sales: float,
+                std_sales: float) -> DecompositionResult:
+
+        # Compute Statistics
+        cv_sales = std_sales / mean_sales if mean_sales != 0 else float('nan')
+
+        # Identify unusually low days (below mean - k*std)
+        low_sales_threshold = mean_sales - self.config.low_sales_std_multiplier * std_sales
+        unusually_low = sales < low_sales_threshold
+
+        # Get group identifier
+        group_id = self.strategy.get_group_identifier(group_key)
+
+        return DecompositionResult(
+            group_id=group_id,
+            dates=pd.DatetimeIndex(sales.index),
+            observed=sales,
+            trend=trend,
+            seasonal=seasonal,
+            residual=residual,
+            statistics=SalesStatistics(
+                mean=mean_sales,
+                std=std_sales,
+                coefficient_of_variation=cv_sales,
+                low_threshold=low_sales_threshold,
+            ),
+            unusually_low=unusually_low,
+        )
+
+    def _combine(self, batches: Iterable[tuple[int, Optional[pd.DataFrame]]]) -> pd.DataFrame:
+
+        count, frames = 0, []
+        for size, frame in batches:
+            count += size
+            if frame is not None:
+                frames.append(frame)
+
+        print(f"Processed {count} groups successfully. Starting to save...")
+
+        return pd.concat(frames, ignore_index=False)
+
+
+def _absorbed(future: Future) -> Any:
+
+    result, records = future.result()
+    TRACER.absorb(records)
+
+    return result
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
 
-        return pd.concat(
-            [result.to_dataframe() for result in results],
-            ignore_index=False
-        )
\ No newline at end of file
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -1,9 +1,24 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+import hashlib
+import json
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from pathlib import Path
+from matplotlib.axes import Axes
+from matplotlib.collections import FillBetweenPolyCollection, PathCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
 from matplotlib.ticker import FuncFormatter
 
+from utils.cache import fingerprint
+from utils.instrumentation import TRACER, run_traced, traced
+
 
 def millions(x, pos):
 
@@ -15,9 +30,65 @@ def millions(x, pos):
         return f"{int(x)}"
     
 
+@dataclass(frozen=True)
+class RenderPreset:
+
+    dpi: int
+    figsize: tuple[float, float]
+
+
+PRESETS = {
+    "thumbnail": RenderPreset(dpi=72, figsize=(10, 6)),
+    "screen": RenderPreset(dpi=100, figsize=(20, 12)),
+    "print": RenderPreset(dpi=300, figsize=(20, 12)),
+}
+
+
+@dataclass
+class RenderManifest:
+    """Hash of the data and settings behind every chart in a directory."""
+
+    save_directory: Path
+    charts: dict[str, str] = field(init=False)
+
+    def __post_init__(self) -> None:
+
+        self.charts = (
+            json.loads(self.path.read_text())
+            if self.path.exists() else {}
+        )
+
+    @property
+    def path(self) -> Path:
+        return Path(self.save_directory) / ".render_manifest.json"
+
+    def key(self, 
+            group_data: pd.DataFrame, 
+            dpi: int, 
+            figsize: tuple[float, float]) -> str:
+
+        values = pd.util.hash_pandas_object(group_data, index=True).to_numpy()
+        return fingerprint(hashlib.sha1(values.tobytes()).hexdigest(), dpi, tuple(figsize))
+
+    def is_current(self, group: str, key: str) -> bool:
+
+        return (
+            self.charts.get(_filename(group)) == key
+            and (Path(self.save_directory) / _filename(group)).exists()
+        )
+
+    def update(self, group: str, key: str) -> None:
+        self.charts[_filename(group)] = key
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps(self.charts, indent=2))
+
+
+@traced("plot")
 def plot(decomposed_per_category: pd.DataFrame,
          save_directory: Path, 
-         dpi: int = 300
+         dpi: int = 300,
+         incremental: bool = True
     ) -> None:
 
     save_directory = Path(save_directory)
@@ -25,26 +96,127 @@ def plot(decomposed_per_category: pd.DataFrame,
 
     plt.style.use('seaborn-v0_8-darkgrid')
 
-    groups = decomposed_per_category['Group'].unique()
+    figsize = (20, 12)
+    manifest = RenderManifest(save_directory)
 
-    for group in groups:
+    for group, group_data in decomposed_per_category.groupby('Group', sort=False):
 
-        group_data = decomposed_per_category[
-            decomposed_per_category['Group'] == group
-        ].copy()
+        key = manifest.key(group_data, dpi, figsize)
+        if incremental and manifest.is_current(group, key):
+            print(f"Unchanged: {save_directory / _filename(group)}")
+            continue
 
-        mean_sales = group_data['Mean Sales Volume'].iloc[0]
-        std_sales = group_data['Std Deviation'].iloc[0]
-        cv_sales = group_data['Coeff of Variation'].iloc[0]
-        num_low_days = group_data['Is Unusually Low'].sum()
-        total_days = len(group_data)
+        _render(group, group_data, save_directory, dpi=dpi, figsize=figsize)
+        manifest.update(group, key)
+
+    manifest.save()
+
+
+@traced("plot")
+def plot_batch(decomposed_per_category: pd.DataFrame,
+               save_directory: Path,
+               preset: str | RenderPreset = "print",
+               workers: int | None = None,
+               incremental: bool = True
+    ) -> None:
+
+    save_directory = Path(save_directory)
+    save_directory.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(preset, str):
+        preset = PRESETS[preset]
+
+    manifest = RenderManifest(save_directory)
+    keys: dict[str, str] = {}
+
+    # Partition once instead of masking the full frame for every group
+    names, frames = [], []
+    for group, group_data in decomposed_per_category.groupby('Group', sort=False):
+
+        keys[group] = manifest.key(group_data, preset.dpi, preset.figsize)
+        if incremental and manifest.is_current(group, keys[group]):
+            print(f"Unchanged: {save_directory / _filename(group)}")
+            continue
+
+        names.append(group)
+        frames.append(group_data)
+
+    render = partial(
+        _render, 
+        save_directory=save_directory, 
+        dpi=preset.dpi, 
+        figsize=preset.figsize
+    )
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for _, records in pool.map(
+            partial(run_traced, TRACER.settings(), render), names, frames, chunksize=8
+        ):
+            TRACER.absorb(records)
+
+    for group in names:
+        manifest.update(group, keys[group])
+
+    manifest.save()
+
+
+def _init_worker() -> None:
+
+    # Workers render headless, the caller's backend and style stay as they were
+    plt.switch_backend('Agg')
+    plt.style.use('seaborn-v0_8-darkgrid')
+
+
+def _render(group: str,
+            group_data: pd.DataFrame,
+            save_directory: Path,
+            dpi: int = 300,
+            figsize: tuple[float, float] = (20, 12)
+    ) -> None:
+
+    # One template per worker process and figure size
+    template = _TEMPLATES.get(tuple(figsize))
+    if template is None:
+        template = _TEMPLATES[tuple(figsize)] = ChartTemplate(figsize=figsize)
+
+    with TRACER.stage("render", group=group, function="_render"):
+        template.render(group, group_data, save_directory / _filename(group), dpi=dpi)
+
+
+# Modern color palette
+COLORS = {
+    'observed': '#0EA5E9',  
+    'trend': '#8B5CF6', 
+    'seasonal': '#F59E0B', 
+    'residual': '#EF4444',
+    'low_sales': '#DC2626', 
+    'accent': '#10B981'
+}
+
+
+@dataclass
+class ChartTemplate:
+    """Decomposition chart whose figure and artists are built once and
+    refilled with each group's data before saving."""
+
+    figsize: tuple[float, float] = (20, 12)
+
+    fig: Figure = field(init=False)
+    axes: list[Axes] = field(init=False)
+    lines: list[Line2D] = field(init=False)
+    fills: list[FillBetweenPolyCollection] = field(init=False)
+    low_days: PathCollection = field(init=False)
+    residuals: PathCollection = field(init=False)
+    stats: Text = field(init=False)
+
+    def __post_init__(self) -> None:
 
         # Create figure with space for statistics
-        fig = plt.figure(figsize=(20, 12), facecolor='#FAFAFA')
-        fig.subplots_adjust(bottom=0.08)
-        
+        self.fig = Figure(figsize=self.figsize, facecolor='#FAFAFA')
+        self.fig.subplots_adjust(bottom=0.08)
+
         # Create grid: 4 rows for plots, 1 row for statistics
-        gs = fig.add_gridspec(
+        gs = self.fig.add_gridspec(
             5, 1, 
             height_ratios=[1.2, 1, 1, 1, 0.35], 
             hspace=0.3,
@@ -53,117 +225,76 @@ def plot(decomposed_per_category: pd.DataFrame,
             left=0.08,
             right=0.96
         )
-        
+
         # Create axes for plots
-        axes = [fig.add_subplot(gs[i, 0]) for i in range(4)]
-        
-        # Modern color palette
-        colors = {
-            'observed': '#0EA5E9',  
-            'trend': '#8B5CF6', 
-            'seasonal': '#F59E0B', 
-            'residual': '#EF4444',
-            'low_sales': '#DC2626', 
-            'accent': '#10B981'
-        }
-        
-        # Overall title with modern styling
-        fig.suptitle(
-            f"{group}" + (f" of Station {group_data['Station'].iloc[0]}" if group_data['Station'].any() else ""), 
-            fontsize=18, 
-            weight="bold",
-            y=0.98,
-            fontfamily='sans-serif'
-        )
-        
+        self.axes = axes = [self.fig.add_subplot(gs[i, 0]) for i in range(4)]
+
+        # Data is filled in per group, the axes only need to expect dates
+        for ax in axes:
+            ax.xaxis_date()
+
         # Plot Observed with unusually low days highlighted
-        axes[0].plot(
-            group_data.index, 
-            group_data['Observed'], 
-            color=colors['observed'], 
+        observed = axes[0].plot(
+            [], [],
+            color=COLORS['observed'], 
             linewidth=2.5,
             alpha=0.9,
             label='Observed'
-        )
+        )[0]
 
-        axes[0].fill_between(
-            group_data.index, 
-            group_data['Observed'], 
+        observed_fill = axes[0].fill_between(
+            [], [], 
             alpha=0.15, 
-            color=colors['observed']
+            color=COLORS['observed']
         )
-        
-        # Highlight unusually low days
-        low_days = group_data[group_data['Is Unusually Low']]
-        if not low_days.empty:
-            axes[0].scatter(
-                low_days['Date'],
-                low_days['Observed'],
-                color=colors['low_sales'],
-                s=80,
-                zorder=5,
-                alpha=0.7,
-                edgecolors='white',
-                linewidth=1.5,
-                label='Unusually Low',
-                marker='.'
-            )
-        
+
+        self.low_days = axes[0].scatter(
+            [], [],
+            color=COLORS['low_sales'],
+            s=80,
+            zorder=5,
+            alpha=0.7,
+            edgecolors='white',
+            linewidth=1.5,
+            label='Unusually Low',
+            marker='.'
+        )
+
         axes[0].set_ylabel("Sales Volume", fontsize=11, weight="bold")
-        axes[0].grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
-        axes[0].yaxis.set_major_formatter(FuncFormatter(millions))
-        axes[0].set_facecolor('#F8F9FA')
-        if not low_days.empty:
-            axes[0].legend(loc='upper right', framealpha=0.9, fontsize=9)
 
-        axes[0].xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-        axes[0].xaxis.set_major_locator(mdates.DayLocator(interval=7))
-        
         # Plot Trend
-        axes[1].plot(
-            group_data.index, 
-            group_data['Trend'], 
-            color=colors['trend'], 
+        trend = axes[1].plot(
+            [], [], 
+            color=COLORS['trend'], 
             linewidth=3,
             alpha=0.9
-        )
-        axes[1].fill_between(
-            group_data.index, 
-            group_data['Trend'], 
+        )[0]
+        trend_fill = axes[1].fill_between(
+            [], [], 
             alpha=0.15, 
-            color=colors['trend']
+            color=COLORS['trend']
         )
         axes[1].set_ylabel("Trend", fontsize=11, weight="bold")
-        axes[1].grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
-        axes[1].yaxis.set_major_formatter(FuncFormatter(millions))
-        axes[1].set_facecolor('#F8F9FA')
 
         # Plot Seasonal
-        axes[2].plot(
-            group_data.index, 
-            group_data['Seasonal'], 
-            color=colors['seasonal'], 
+        seasonal = axes[2].plot(
+            [], [], 
+            color=COLORS['seasonal'], 
             linewidth=2.5,
             alpha=0.9
-        )
-        axes[2].fill_between(
-            group_data.index, 
-            group_data['Seasonal'], 
+        )[0]
+        seasonal_fill = axes[2].fill_between(
+            [], [], 
             alpha=0.15, 
-            color=colors['seasonal']
+            color=COLORS['seasonal']
         )
         axes[2].axhline(0, color='gray', linewidth=1, linestyle='--', alpha=0.5)
         axes[2].set_ylabel("Seasonal", fontsize=11, weight="bold")
-        axes[2].grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
-        axes[2].yaxis.set_major_formatter(FuncFormatter(millions))
-        axes[2].set_facecolor('#F8F9FA')
 
-        
         # Plot Residual
-        axes[3].scatter(
-            group_data.index, 
-            group_data['Residual'], 
-            color=colors['residual'], 
+        self.residuals = axes[3].scatter(
+            [], [], 
+            color=COLORS['residual'], 
             s=30,
             alpha=0.7,
             edgecolors='white',
@@ -172,12 +303,16 @@ def plot(decomposed_per_category: pd.DataFrame,
         axes[3].axhline(0, color='black', linewidth=1.5, linestyle='-', alpha=0.6)
         axes[3].set_ylabel("Residual", fontsize=11, weight="bold")
         axes[3].set_xlabel("Date", fontsize=11, weight="bold")
-        axes[3].grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
-        axes[3].yaxis.set_major_formatter(FuncFormatter(millions))
-        axes[3].set_facecolor('#F8F9FA')
-        
+
+        self.lines = [observed, trend, seasonal]
+        self.fills = [observed_fill, trend_fill, seasonal_fill]
+
         # Add subtle spine styling and modify axes
         for ax in axes:
+            ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5)
+            ax.yaxis.set_major_formatter(FuncFormatter(millions))
+            ax.set_facecolor('#F8F9FA')
+
             for spine in ['top', 'right']:
                 ax.spines[spine].set_visible(False)
             for spine in ['bottom', 'left']:
@@ -187,23 +322,15 @@ def plot(decomposed_per_category: pd.DataFrame,
             ax.tick_params(colors='#6B7280', labelsize=9)
             ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))
             ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-        
+
         # Add statistics text box at the bottom
-        stats_ax = fig.add_subplot(gs[4, 0])
+        stats_ax = self.fig.add_subplot(gs[4, 0])
         stats_ax.axis('off')
-        
-        # Format statistics text
-        stats_text = (
-            f"Mean Sales Volume: {mean_sales:,.0f}\n"
-            f"Standard Deviation: {std_sales:,.0f}\n"
-            f"Coefficient of Variation: {cv_sales:.2%}\n"
-            f"Unusually Low Days: {num_low_days}/{total_days} ({num_low_days/total_days:.1%})"
-        )
-        
+
         # Create a box for statistics
-        stats_ax.text(
+        self.stats = stats_ax.text(
             0.02, 0.85,
-            stats_text,
+            "",
             transform=stats_ax.transAxes,
             fontsize=8, 
             verticalalignment='top',
@@ -220,11 +347,60 @@ def plot(decomposed_per_category: pd.DataFrame,
                 alpha=0.0
             )
         )
-        
+
+    def render(self,
+               group: str,
+               group_data: pd.DataFrame,
+               filepath: Path,
+               dpi: int = 300) -> None:
+
+        mean_sales = group_data['Mean Sales Volume'].iloc[0]
+        std_sales = group_data['Std Deviation'].iloc[0]
+        cv_sales = group_data['Coeff of Variation'].iloc[0]
+        num_low_days = group_data['Is Unusually Low'].sum()
+        total_days = len(group_data)
+
+        # Overall title with modern styling
+        self.fig.suptitle(
+            f"{group}" + (f" of Station {group_data['Station'].iloc[0]}" if group_data['Station'].any() else ""), 
+            fontsize=18, 
+            weight="bold",
+            y=0.98,
+            fontfamily='sans-serif'
+        )
+
+        dates = group_data.index
+
+        for line, fill, column in zip(self.lines, self.fills, ['Observed', 'Trend', 'Seasonal']):
+            line.set_data(dates, group_data[column])
+            fill.set_data(dates, group_data[column], 0)
+
+        _set_points(self.residuals, dates, group_data['Residual'])
+
+        # Highlight unusually low days
+        low_days = group_data[group_data['Is Unusually Low']]
+        _set_points(self.low_days, low_days['Date'], low_days['Observed'])
+        self.low_days.set_visible(not low_days.empty)
+
+        if not low_days.empty:
+            self.axes[0].legend(loc='upper right', framealpha=0.9, fontsize=9)
+        elif self.axes[0].get_legend() is not None:
+            self.axes[0].get_legend().remove()
+
+        for ax in self.axes:
+            ax.relim(visible_only=True)
+            ax.autoscale_view()
+
+        # Format statistics text
+        self.stats.set_text(
+            f"Mean Sales Volume: {mean_sales:,.0f}\n"
+            f"Standard Deviation: {std_sales:,.0f}\n"
+            f"Coefficient of Variation: {cv_sales:.2%}\n"
+            f"Unusually Low Days: {num_low_days}/{total_days} ({num_low_days/total_days:.1%})"
+        )
+
         # Save chart
-        filename = f"{group.replace(' ', '_').replace('/', '-')}.png"
-        filepath = save_directory / filename
-        plt.savefig(
+        self.fig.savefig(
             filepath, 
             dpi=dpi, 
             bbox_inches='tight',
@@ -233,14 +409,24 @@ def plot(decomposed_per_category: pd.DataFrame,
         )
         print(f"Saved: {filepath}")
 
-        plt.close(fig)
-    
-
-
 
+_TEMPLATES: dict[tuple[float, float], ChartTemplate] = {}
 
 
+def _set_points(collection: PathCollection,
+                x: pd.Index | pd.Series,
+                y: pd.Series) -> None:
 
+    # Mask missing values the way Axes.scatter does
+    x = np.ma.masked_invalid(mdates.date2num(x))
+    y = np.ma.masked_invalid(np.asarray(y, dtype=float))
+    mask = np.ma.getmaskarray(x) | np.ma.getmaskarray(y)
 
+    collection.set_offsets(np.ma.column_stack([
+        np.ma.array(x, mask=mask), 
+        np.ma.array(y, mask=mask)
+    ]))
 
 
+def _filename(group: str) -> str:
+    return f"{group.replace(' ', '_').replace('/', '-')}.png"
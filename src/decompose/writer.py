@@ -0,0 +1,142 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from decompose.decomposer import DecompositionResult
+
+
+COMPONENTS_SCHEMA = pa.schema([
+    ("Group", pa.string()),
+    ("Date", pa.timestamp("ns")),
+    ("Observed", pa.float64()),
+    ("Trend", pa.float64()),
+    ("Seasonal", pa.float64()),
+    ("Residual", pa.float64()),
+    ("Is Unusually Low", pa.bool_()),
+])
+
+STATISTICS_SCHEMA = pa.schema([
+    ("Station", pa.int64()),
+    ("Group", pa.string()),
+    ("Days", pa.int64()),
+    ("Mean Sales Volume", pa.float64()),
+    ("Std Deviation", pa.float64()),
+    ("Coeff of Variation", pa.float64()),
+    ("Low Threshold", pa.float64()),
+    ("Unusually Low Days", pa.int64()),
+])
+
+
+@dataclass
+class DecompositionWriter:
+    """Streams decomposition results into compact, station-partitioned Parquet.
+
+    Per-date components go under ``components/station=<id>/`` and one row of
+    statistics per group under ``statistics/``.
+    """
+
+    directory: Path
+    statistics_batch: int = 1024
+
+    _components: Optional[pq.ParquetWriter] = field(default=None, init=False)
+    _station: Any = field(default=None, init=False)
+
+    def write(self, results: Iterable[DecompositionResult]) -> int:
+
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        rows: list[dict[str, Any]] = []
+        count = 0
+
+        statistics = pq.ParquetWriter(
+            self._next_part(self.directory / "statistics"), STATISTICS_SCHEMA
+        )
+
+        try:
+            for result in results:
+
+                self._write_components(result)
+                rows.append(self._statistics_row(result))
+                count += 1
+
+                if len(rows) >= self.statistics_batch:
+                    statistics.write_table(pa.Table.from_pylist(rows, STATISTICS_SCHEMA))
+                    rows = []
+
+            if rows:
+                statistics.write_table(pa.Table.from_pylist(rows, STATISTICS_SCHEMA))
+
+        finally:
+            statistics.close()
+            self._close_components()
+
+        print(f"Saved {count} groups to {self.directory}")
+        return count
+
+    def _write_components(self, result: DecompositionResult) -> None:
+
+        station = result.group_id.get("station")
+
+        # Only one partition file is open at a time
+        if self._components is None or station != self._station:
+            self._close_components()
+            self._components = self._open_components(station)
+            self._station = station
+
+        table = pa.table({
+            "Group": pa.array([result.group_id.get("category")] * len(result.dates), pa.string()),
+            "Date": pa.array(result.dates.to_numpy(dtype="datetime64[ns]")),
+            "Observed": pa.array(np.asarray(result.observed, dtype=float)),
+            "Trend": pa.array(np.asarray(result.trend, dtype=float)),
+            "Seasonal": pa.array(np.asarray(result.seasonal, dtype=float)),
+            "Residual": pa.array(np.asarray(result.residual, dtype=float)),
+            "Is Unusually Low": pa.array(np.asarray(result.unusually_low, dtype=bool)),
+        }, schema=COMPONENTS_SCHEMA)
+
+        self._components.write_table(table)
+
+    def _open_components(self, station: Any) -> pq.ParquetWriter:
+
+        name = "__HIVE_DEFAULT_PARTITION__" if station is None else str(station)
+
+        return pq.ParquetWriter(
+            self._next_part(self.directory / "components" / f"station={name}"),
+            COMPONENTS_SCHEMA
+        )
+
+    def _next_part(self, partition: Path) -> Path:
+
+        partition.mkdir(parents=True, exist_ok=True)
+
+        # Repeated writes append new part files instead of overwriting
+        part = 0
+        while (partition / f"part-{part:05d}.parquet").exists():
+            part += 1
+
+        return partition / f"part-{part:05d}.parquet"
+
+    def _close_components(self) -> None:
+
+        if self._components is not None:
+            self._components.close()
+            self._components = None
+
+    def _statistics_row(self, result: DecompositionResult) -> dict[str, Any]:
+
+        station = result.group_id.get("station")
+
+        return {
+            "Station": None if station is None else int(station),
+            "Group": result.group_id.get("category"),
+            "Days": len(result.dates),
+            "Mean Sales Volume": float(result.statistics.mean),
+            "Std Deviation": float(result.statistics.std),
+            "Coeff of Variation": float(result.statistics.coefficient_of_variation),
+            "Low Threshold": float(result.statistics.low_threshold),
+            "Unusually Low Days": int(np.asarray(result.unusually_low).sum()),
+        }
@@ -0,0 +1,296 @@
+from dataclasses import asdict, dataclass, field
+import json
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait as wait_ready
+from multiprocessing.process import BaseProcess
+import os
+import re
+from pathlib import Path
+import signal
+import time
+from typing import Any, Iterator, Optional
+
+import pandas as pd
+
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from data.store import PartitionedStore
+from forecast.models.base_config import BaseConfig
+from forecast.models.base_forecaster import BaseForecaster
+from strategy.strategy import StationByProductStrategy
+from utils.cache import fingerprint
+from utils.errors import DataValidationError
+from utils.instrumentation import TRACER, run_traced
+
+
+@dataclass(frozen=True)
+class GroupTiming:
+
+    station: int
+    product: str
+    status: str
+    fit_seconds: float
+    predict_seconds: float
+    error: str = ""
+
+
+@dataclass
+class BatchForecaster:
+    """Fits and forecasts every station/product group, resuming from checkpoints.
+
+    Each finished group leaves ``checkpoints/<group>.parquet`` with its
+    forecast and ``checkpoints/<group>.json`` with its timing, so a rerun
+    skips them. Failed or timed out groups are retried on the next run.
+    With several workers or a timeout, every group runs in its own process,
+    which is killed, together with any solver it started, once it runs past
+    ``timeout`` seconds.
+    With a ``store``, groups are read from its partitions instead of
+    being preprocessed from raw sales.
+    """
+
+    schema: ColumnSchema
+    model_type: type[BaseForecaster]
+    config: BaseConfig
+    directory: Path
+    days: int = 7
+    workers: int = 1
+    timeout: Optional[float] = None
+    options: dict[str, Any] = field(default_factory=dict)
+    store: Optional[PartitionedStore] = None
+
+    def groups(self, 
+               sales: Optional[pd.DataFrame] = None) -> Iterator[tuple[StationByProductStrategy, pd.DataFrame]]:
+
+        if self.store is not None:
+            for (station, product), group in self.store.iter_groups(StationByProductStrategy()):
+                yield StationByProductStrategy(station=int(station), product=product), group
+            return
+
+        daily = DataPreprocessor(
+            schema=self.schema,
+            strategy=StationByProductStrategy()
+        ).preprocess(data=sales)
+
+        for (station, product), group in daily.groupby(
+            [self.schema.station, self.schema.product]
+        ):
+            yield StationByProductStrategy(station=int(station), product=product), group
+
+    def run(self, sales: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+
+        if sales is None and self.store is None:
+            raise DataValidationError("Sales are required when the batch has no store")
+
+        self.directory = Path(self.directory)
+        self.checkpoints.mkdir(parents=True, exist_ok=True)
+
+        pending = [
+            (strategy, group) for strategy, group in self.groups(sales)
+            if not self._checkpoint(strategy).with_suffix(".parquet").exists()
+        ]
+        print(f"Forecasting {len(pending)} groups "
+              f"({len(list(self.checkpoints.glob('*.parquet')))} already done)")
+
+        for strategy, forecast, timing in self._iter_tasks(pending):
+            self._save(strategy, forecast, timing)
+
+            if timing.status != "ok":
+                print(f"{strategy}: {timing.status} {timing.error}")
+
+        return self.consolidate()
+
+    @property
+    def checkpoints(self) -> Path:
+        return Path(self.directory) / "checkpoints"
+
+    def consolidate(self) -> pd.DataFrame:
+
+        files = sorted(self.checkpoints.glob("*.parquet"))
+        forecasts = (
+            pd.concat([pd.read_parquet(file) for file in files], ignore_index=True)
+            if files else pd.DataFrame()
+        )
+        forecasts.to_parquet(Path(self.directory) / "forecasts.parquet", index=False)
+
+        timings = pd.DataFrame([
+            json.loads(file.read_text())
+            for file in sorted(self.checkpoints.glob("*.json"))
+        ])
+        timings.to_csv(Path(self.directory) / "timings.csv", index=False)
+
+        print(f"Saved {len(files)} group forecasts to {self.directory}")
+        return forecasts
+
+    def _iter_tasks(self,
+                    pending: list[tuple[StationByProductStrategy, pd.DataFrame]]) -> Iterator[tuple]:
+
+        task = dict(
+            model_type=self.model_type,
+            schema=self.schema,
+            config=self.config,
+            days=self.days,
+            options=self.options,
+        )
+
+        if self.workers <= 1 and not self.timeout:
+            for strategy, group in pending:
+                yield (strategy, *_forecast_group(strategy=strategy, sales=group, **task))
+            return
+
+        context = multiprocessing.get_context()
+
+        queue = iter(pending)
+        running: dict[Connection, tuple[StationByProductStrategy, BaseProcess, Optional[float]]] = {}
+
+        while True:
+            while len(running) < max(self.workers, 1):
+                item = next(queue, None)
+                if item is None:
+                    break
+
+                strategy, group = item
+                receiver, sender = context.Pipe(duplex=False)
+
+                process = context.Process(
+                    target=_run_isolated, 
+                    args=(sender, TRACER.settings(), dict(strategy=strategy, sales=group, **task)),
+                    daemon=True
+                )
+                process.start()
+                sender.close()
+
+                deadline = time.monotonic() + self.timeout if self.timeout else None
+                running[receiver] = (strategy, process, deadline)
+
+            if not running:
+                return
+
+            # Wake for the first finished group or the nearest deadline
+            deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+            timeout = max(min(deadlines) - time.monotonic(), 0.0) if deadlines else None
+
+            for receiver in wait_ready(list(running), timeout=timeout):
+                strategy, process, _ = running.pop(receiver)
+                yield (strategy, *_receive(receiver, process, strategy))
+
+            now = time.monotonic()
+            for receiver in [
+                receiver for receiver, (_, _, deadline) in running.items()
+                if deadline is not None and deadline <= now
+            ]:
+                strategy, process, _ = running.pop(receiver)
+
+                _kill(process)
+                receiver.close()
+
+                yield strategy, None, GroupTiming(
+                    strategy.station, strategy.product, "timeout", 0.0, 0.0,
+                    f"Exceeded {self.timeout}s"
+                )
+
+    def _checkpoint(self, strategy: StationByProductStrategy) -> Path:
+
+        # Readable prefix, the digest keeps names like "A B" and "A_B" apart
+        product = re.sub(r"[^0-9A-Za-z-]+", "-", str(strategy.product))
+        digest = fingerprint(strategy.station, strategy.product)[:10]
+
+        return self.checkpoints / f"{strategy.station}_{product}_{digest}"
+
+    def _save(self,
+              strategy: StationByProductStrategy,
+              forecast: Optional[pd.DataFrame],
+              timing: GroupTiming) -> None:
+
+        checkpoint = self._checkpoint(strategy)
+
+        checkpoint.with_suffix(".json").write_text(json.dumps(asdict(timing)))
+
+        # The parquet file marks the group as done, so write it last
+        if forecast is not None:
+            staging = checkpoint.with_suffix(".tmp")
+            forecast.to_parquet(staging, index=False)
+            staging.replace(checkpoint.with_suffix(".parquet"))
+
+
+def _forecast_group(model_type: type[BaseForecaster],
+                    schema: ColumnSchema,
+                    config: BaseConfig,
+                    strategy: StationByProductStrategy,
+                    sales: pd.DataFrame,
+                    days: int,
+                    options: dict[str, Any]) -> tuple[Optional[pd.DataFrame], GroupTiming]:
+
+    fit_seconds = predict_seconds = 0.0
+
+    try:
+        model = model_type(schema=schema, strategy=strategy, config=config, **options)
+
+        start = time.perf_counter()
+        model.fit(sales=sales, holdout=False)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        forecast = model.predict(days=days)
+        predict_seconds = time.perf_counter() - start
+
+    except Exception as error:
+        return None, GroupTiming(strategy.station, strategy.product, "failed",
+                                 fit_seconds, predict_seconds, f"{type(error).__name__}: {error}")
+
+    frame = pd.DataFrame({
+        schema.station: strategy.station,
+        schema.product: strategy.product,
+        schema.date: forecast.time_index,
+        schema.sales: forecast.values()[:, 0],
+    })
+
+    return frame, GroupTiming(strategy.station, strategy.product, "ok",
+                              fit_seconds, predict_seconds)
+
+
+def _run_isolated(sender: Connection, 
+                  tracing: tuple[bool, bool], 
+                  task: dict[str, Any]) -> None:
+
+    # A process group of its own, so a kill also reaches solver children
+    # such as cmdstan that Prophet starts; Windows has no process groups
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    sender.send(run_traced(tracing, _forecast_group, **task))
+    sender.close()
+
+
+def _receive(receiver: Connection,
+             process: BaseProcess,
+             strategy: StationByProductStrategy) -> tuple[Optional[pd.DataFrame], GroupTiming]:
+
+    try:
+        result, records = receiver.recv()
+        TRACER.absorb(records)
+    except EOFError:
+        # The process died before answering, e.g. killed for memory
+        process.join()
+        result = None, GroupTiming(strategy.station, strategy.product, "failed", 0.0, 0.0,
+                                   f"Worker exited with code {process.exitcode}")
+
+    receiver.close()
+    process.join()
+
+    return result
+
+
+def _kill(process: BaseProcess) -> None:
+
+    if not hasattr(os, "killpg"):
+        process.kill()
+        process.join()
+        return
+
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+    process.join()
@@ -3,13 +3,13 @@ from typing import Sequence
 
 from darts import TimeSeries
 import pandas as pd
-from darts.dataprocessing.transformers import Scaler, MissingValuesFiller
-from sklearn.preprocessing import RobustScaler
+import numpy as np
 
 from data.preprocessor import DataPreprocessor
 from data.schema import ColumnSchema
 from forecast.models.base_config import BaseConfig
 from strategy.strategy import GroupingStrategy
+from utils.instrumentation import traced
 
 
 @dataclass(frozen=True, slots=True)
@@ -30,6 +30,18 @@ class DataSplit:
               f"Validating on {self.val_size} points")
 
 
+@dataclass(frozen=True, slots=True)
+class GroupedSplit:
+    groups: list[dict]
+    train: list[TimeSeries]
+    val: list[TimeSeries]
+
+    def display_info(self) -> None:
+        print(f"Training on {len(self.groups)} series | "
+              f"{sum(len(series) for series in self.train)} points | "
+              f"Validating on {sum(len(series) for series in self.val)} points")
+
+
 @dataclass(slots=True)
 class DataFramePreprocessor:
 
@@ -53,22 +65,65 @@ class TimeSeriesBuilder:
     schema: ColumnSchema
     config: BaseConfig
 
-    filler: MissingValuesFiller = MissingValuesFiller(fill='auto')
-
     def build(self, data: pd.DataFrame) -> TimeSeries:
 
-        # Create to Time Series
-        series = TimeSeries.from_dataframe(
-            data,
-            time_col=self.schema.date,
-            value_cols=self.schema.sales,
-            fill_missing_dates=self.config.fill_missing_dates,
-            freq=self.config.frequency
-        )
+        return self.build_many([data])[0]
+    
+
+    def build_series(self, sales: pd.Series) -> TimeSeries:
+
+        # A date-indexed daily series, e.g. a SalesCube slice
+        return self.build(pd.DataFrame({
+            self.schema.date: sales.index,
+            self.schema.sales: sales.to_numpy(dtype=float),
+        }))
+    
+
+    @traced("build")
+    def build_many(self, groups: Sequence[pd.DataFrame]) -> list[TimeSeries]:
+
+        # Reindex every group onto its own daily range, end to end in one array
+        indexes, positions = [], []
+        offset = 0
+
+        for data in groups:
+            dates = pd.DatetimeIndex(data[self.schema.date])
+
+            if self.config.fill_missing_dates:
+                index = pd.date_range(dates.min(), dates.max(), 
+                                      freq=self.config.frequency, name=self.schema.date)
+            else:
+                index = pd.DatetimeIndex(dates, freq=self.config.frequency, name=self.schema.date)
+
+            indexes.append(index)
+            positions.append(offset + index.get_indexer(dates))
+            offset += len(index)
+
+        lengths = np.array([len(index) for index in indexes], dtype=np.int64)
+        bounds = np.concatenate([[0], np.cumsum(lengths)])
+
+        values = np.full(offset, np.nan)
+        if groups:
+            values[np.concatenate(positions)] = np.concatenate(
+                [data[self.schema.sales].to_numpy(dtype=float) for data in groups]
+            )
 
         # Fill Missing Values
-        filled = self.filler.transform(series)
-        return filled if isinstance(filled, TimeSeries) else filled[0]
+        filled = _interpolate(
+            values,
+            starts=np.repeat(bounds[:-1], lengths),
+            ends=np.repeat(bounds[1:] - 1, lengths)
+        )
+
+        return [
+            TimeSeries.from_times_and_values(
+                index, 
+                filled[bounds[i]:bounds[i + 1], np.newaxis],
+                columns=[self.schema.sales],
+                copy=False
+            )
+            for i, index in enumerate(indexes)
+        ]
     
 
     def split(self, series: TimeSeries) -> DataSplit:
@@ -78,39 +133,110 @@ class TimeSeriesBuilder:
         )
 
 
+@dataclass(slots=True)
+class RobustSeriesScaler:
+    """Per-series median/IQR scaling, numerically matching sklearn's RobustScaler.
+
+    Parameters for every fitted series live in ``(n_series, n_components)``
+    arrays, so a whole batch is fitted, transformed or inverted at once.
+    """
+
+    quantile_range: tuple[float, float] = (25.0, 75.0)
+
+    center: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    scale: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+
+    def fit(self, series: Sequence[TimeSeries]) -> "RobustSeriesScaler":
+
+        values = _stack(series)
+
+        # Pad rows are NaN, so the nan-aware reductions ignore them
+        self.center = np.nanmedian(values, axis=1)
+        low, high = np.nanpercentile(values, self.quantile_range, axis=1)
+
+        scale = high - low
+        scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+        self.scale = scale
+
+        return self
+
+    def transform(self, series: Sequence[TimeSeries]) -> list[TimeSeries]:
+
+        return self._apply(series, lambda values: (values - self.center[:, None]) / self.scale[:, None])
+
+    def inverse_transform(self, series: Sequence[TimeSeries]) -> list[TimeSeries]:
+
+        return self._apply(series, lambda values: values * self.scale[:, None] + self.center[:, None])
+
+    def fit_transform(self, series: Sequence[TimeSeries]) -> list[TimeSeries]:
+
+        return self.fit(series).transform(series)
+
+    def _apply(self, series: Sequence[TimeSeries], operation) -> list[TimeSeries]:
+
+        if len(series) != len(self.center):
+            raise ValueError(
+                f"Scaler was fitted on {len(self.center)} series, got {len(series)}"
+            )
+
+        values = operation(_stack(series))
+
+        return [
+            single.with_values(values[i, :len(single)].reshape(single.values(copy=False).shape))
+            for i, single in enumerate(series)
+        ]
+
+
+def _stack(series: Sequence[TimeSeries]) -> np.ndarray:
+
+    # (n_series, longest, n_components), ragged series padded with NaN
+    longest = max((len(single) for single in series), default=0)
+    width = series[0].n_components if len(series) else 1
+
+    stacked = np.full((len(series), longest, width), np.nan)
+    for i, single in enumerate(series):
+        stacked[i, :len(single)] = single.values(copy=False).reshape(len(single), width)
+
+    return stacked
+
+
 @dataclass(slots=True)
 class SeriesScaler:
     
-    scaler: Scaler = Scaler(RobustScaler())
-
-    def _ensure_single_series(self, result: object) -> TimeSeries:
-        if isinstance(result, TimeSeries):
-            return result
-
-        if isinstance(result, (list, tuple)):
-            current = result
-            while True:
-                if isinstance(current, TimeSeries):
-                    return current
-                if isinstance(current, (list, tuple)) and len(current) > 0:
-                    current = current[0]
-                    continue
-                raise TypeError(f"Cannot extract TimeSeries from object of type {type(result)!r}")
-
-        raise TypeError(f"Cannot extract TimeSeries from object of type {type(result)!r}")
-    
+    scaler: RobustSeriesScaler = field(default_factory=RobustSeriesScaler)
+
+    @traced("scale")
     def scale(self, split: DataSplit) -> DataSplit:
 
-        train_scaled = self._ensure_single_series(self.scaler.fit_transform(split.train))
-        val_scaled = self._ensure_single_series(self.scaler.transform(split.val))
+        train_scaled = self.scale_train(split.train)
+        val_scaled = self.scaler.transform([split.val])[0]
 
         return DataSplit(train=train_scaled, val=val_scaled)
 
+    def scale_train(self, train: TimeSeries) -> TimeSeries:
+
+        return self.scaler.fit_transform([train])[0]
+
+    def transform(self, series: TimeSeries) -> TimeSeries:
+
+        return self.scaler.transform([series])[0]
+
     def inverse(self, series: TimeSeries) -> TimeSeries:
 
-        inversed = self.scaler.inverse_transform(series)
-        return self._ensure_single_series(inversed)
+        return self.scaler.inverse_transform([series])[0]
+
+    @traced("scale")
+    def scale_many(self, split: GroupedSplit) -> GroupedSplit:
+
+        # Each series keeps its own median and IQR
+        train_scaled = self.scaler.fit_transform(split.train)
+        val_scaled = self.scaler.transform(split.val)
 
+        return GroupedSplit(groups=split.groups, train=train_scaled, val=val_scaled)
+
+    def inverse_many(self, series: Sequence[TimeSeries]) -> list[TimeSeries]:
+
+        return self.scaler.inverse_transform(series)
 
 
 @dataclass(slots=True)
@@ -122,7 +248,7 @@ class DataTransformer:
 
     builder: TimeSeriesBuilder = field(init=False)
     scaler: SeriesScaler = field(init=False)
-    datasplit: DataSplit = field(init=False)
+    datasplit: DataSplit | GroupedSplit = field(init=False)
     
 
     def __post_init__(self) -> None:
@@ -130,16 +256,20 @@ class DataTransformer:
         self.scaler = SeriesScaler()
     
 
-    def transform(self, sales: pd.DataFrame) -> DataSplit:
+    def transform(self, sales: pd.DataFrame | pd.Series) -> DataSplit:
 
-        # Preprocess and Standardize Data
-        sales = sales.copy()
-        sales = DataPreprocessor(
-            schema=self.schema, strategy=self.strategy
-        ).preprocess(data=sales)
+        if isinstance(sales, pd.Series):
+            # Daily series such as SalesCube slices are already aggregated
+            series = self.builder.build_series(sales)
+        else:
+            # Preprocess and Standardize Data
+            sales = sales.copy()
+            sales = DataPreprocessor(
+                schema=self.schema, strategy=self.strategy
+            ).preprocess(data=sales)
 
-        # Create Series from Data
-        series = self.builder.build(sales)
+            # Create Series from Data
+            series = self.builder.build(sales)
 
         # Split Data and Display Info
         self.datasplit = self.builder.split(series)
@@ -154,4 +284,103 @@ class DataTransformer:
     def inverse(self, series: TimeSeries) -> TimeSeries:
 
         return self.scaler.inverse(series)
-        
\ No newline at end of file
+
+    
+    def extend(self, 
+               history: TimeSeries, 
+               sales: pd.DataFrame) -> TimeSeries:
+
+        # Newly arrived days replace any overlapping ones in the history
+        sales = DataPreprocessor(
+            schema=self.schema, strategy=self.strategy
+        ).preprocess(data=sales.copy())
+
+        observed = history.to_dataframe().reset_index()
+        observed.columns = [self.schema.date, self.schema.sales]
+        observed = observed[~observed[self.schema.date].isin(sales[self.schema.date])]
+
+        combined = pd.concat(
+            [observed, sales[[self.schema.date, self.schema.sales]]],
+            ignore_index=True
+        ).sort_values(self.schema.date)
+
+        return self.builder.build(combined)
+
+    def transform_many(self, 
+                       sales: pd.DataFrame, 
+                       min_train_length: int = 1) -> GroupedSplit:
+
+        sales = sales.copy()
+        sales = DataPreprocessor(
+            schema=self.schema, strategy=self.strategy
+        ).preprocess(data=sales)
+
+        group_cols = self.strategy.get_grouping_columns(schema=self.schema)
+        group_by_cols = [col for col in group_cols if col != self.schema.date]
+
+        keys, frames = zip(*sales.groupby(group_by_cols)) if len(sales) else ((), ())
+
+        # Create Series from Data, all groups in one pass
+        built = self.builder.build_many(frames)
+
+        groups, train, val = [], [], []
+
+        for group_key, series in zip(keys, built):
+
+            # Too short to hold back a validation window and still train
+            if len(series) < self.config.validation_days + min_train_length:
+                continue
+
+            split = self.builder.split(series)
+
+            groups.append(self.strategy.get_group_identifier(group_key))
+            train.append(split.train)
+            val.append(split.val)
+
+        # Split Data and Display Info
+        self.datasplit = GroupedSplit(groups=groups, train=train, val=val)
+        self.datasplit.display_info()
+
+        return self.scaler.scale_many(self.datasplit)
+
+    
+    def inverse_many(self, series: Sequence[TimeSeries]) -> list[TimeSeries]:
+
+        return self.scaler.inverse_many(series)
+
+
+def _interpolate(values: np.ndarray, 
+                 starts: np.ndarray, 
+                 ends: np.ndarray) -> np.ndarray:
+    """Linear gap filling for series laid end to end, holding the edges constant.
+
+    ``starts``/``ends`` give each element's series bounds so no gap is ever
+    bridged across two series.
+    """
+
+    position = np.arange(len(values))
+    valid = ~np.isnan(values)
+
+    previous = np.maximum.accumulate(np.where(valid, position, -1))
+    following = np.minimum.accumulate(
+        np.where(valid, position, len(values))[::-1]
+    )[::-1]
+
+    has_previous = previous >= starts
+    has_following = following <= ends
+
+    previous = np.where(has_previous, previous, following)
+    following = np.where(has_following, following, previous)
+
+    # Gaps with no valid value in their series stay missing
+    safe_previous = np.clip(previous, 0, len(values) - 1)
+    safe_following = np.clip(following, 0, len(values) - 1)
+
+    span = np.where(following > previous, following - previous, 1)
+    weight = (position - previous) / span
+
+    filled = values[safe_previous] + (values[safe_following] - values[safe_previous]) * weight
+    filled[~(has_previous | has_following)] = np.nan
+    filled[valid] = values[valid]
+
+    return filled
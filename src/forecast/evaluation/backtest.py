@@ -0,0 +1,200 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import time
+from typing import Any, Optional
+
+from darts import TimeSeries
+import numpy as np
+import pandas as pd
+
+from data.preprocessor import DataPreprocessor
+from data.schema import ColumnSchema
+from forecast.data.transformer_pipeline import SeriesScaler, TimeSeriesBuilder
+from forecast.evaluation.metrics import BatchMetrics, pad_rows
+from forecast.models.base_config import BaseConfig
+from forecast.models.base_forecaster import BaseForecaster
+from strategy.strategy import GroupingStrategy
+from utils.errors import InsufficientDataError
+from utils.instrumentation import TRACER, run_traced
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+
+    horizon: int = 7
+    stride: int = 7
+    folds: int = 8
+    window: str = "expanding"
+    train_days: Optional[int] = None
+    minimum_train_days: int = 30
+    refit_every: int = 1
+    season: int = 7
+    workers: int = 1
+
+
+@dataclass(frozen=True)
+class Fold:
+
+    number: int
+    start: int
+    cutoff: int
+    refit: bool
+
+
+@dataclass
+class Backtester:
+    """Rolling-origin evaluation of a forecaster over the history of one strategy.
+
+    Folds end ``stride`` days apart, the last one at the end of the data. A
+    fold that does not refit reuses the last fitted model and scaler. Models
+    that accept a series at prediction time are conditioned on the data up to
+    the fold's own cutoff; the rest forecast through the gap from the fitted
+    cutoff, which the ``lead_start``/``lead_end`` columns record.
+    """
+
+    schema: ColumnSchema
+    strategy: GroupingStrategy
+    model_type: type[BaseForecaster]
+    config: BaseConfig
+    backtest: BacktestConfig = BacktestConfig()
+
+    def folds(self, length: int) -> list[Fold]:
+
+        horizon, stride = self.backtest.horizon, self.backtest.stride
+
+        cutoffs = [
+            length - horizon - k * stride
+            for k in reversed(range(self.backtest.folds))
+        ]
+        cutoffs = [cutoff for cutoff in cutoffs if cutoff >= self.backtest.minimum_train_days]
+
+        if not cutoffs:
+            raise InsufficientDataError(
+                f"{length} days cannot hold a {self.backtest.minimum_train_days} day "
+                f"training window and a {horizon} day horizon"
+            )
+
+        # Rolling windows keep the length of the first fold's history
+        train_days = self.backtest.train_days or cutoffs[0]
+
+        return [
+            Fold(
+                number=number,
+                start=0 if self.backtest.window == "expanding" else max(0, cutoff - train_days),
+                cutoff=cutoff,
+                refit=number % self.backtest.refit_every == 0,
+            )
+            for number, cutoff in enumerate(cutoffs)
+        ]
+
+    def run(self, sales: pd.DataFrame) -> pd.DataFrame:
+
+        sales = DataPreprocessor(
+            schema=self.schema, strategy=self.strategy
+        ).preprocess(data=sales.copy())
+
+        series = TimeSeriesBuilder(self.schema, self.config).build(sales)
+
+        # Folds between refits share a model, so each refit starts a task
+        tasks: list[list[Fold]] = []
+        for fold in self.folds(len(series)):
+            if fold.refit:
+                tasks.append([])
+            tasks[-1].append(fold)
+
+        task = dict(
+            model_type=self.model_type,
+            schema=self.schema,
+            strategy=self.strategy,
+            config=self.config,
+            series=series,
+            horizon=self.backtest.horizon,
+            season=self.backtest.season,
+        )
+
+        if self.backtest.workers <= 1:
+            rows = [row for folds in tasks for row in _run_folds(folds=folds, **task)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.backtest.workers) as pool:
+                futures = [
+                    pool.submit(run_traced, TRACER.settings(), _run_folds, folds=folds, **task)
+                    for folds in tasks
+                ]
+
+                rows = []
+                for future in futures:
+                    task_rows, records = future.result()
+                    TRACER.absorb(records)
+                    rows.extend(task_rows)
+
+        return pd.DataFrame(rows)
+
+
+def _run_folds(model_type: type[BaseForecaster],
+               schema: ColumnSchema,
+               strategy: GroupingStrategy,
+               config: BaseConfig,
+               series: TimeSeries,
+               horizon: int,
+               season: int,
+               folds: list[Fold]) -> list[dict[str, Any]]:
+
+    forecaster = model_type(schema=schema, strategy=strategy, config=config)
+
+    # The first fold of every task is the one that fits
+    fitted = folds[0]
+    scaler = SeriesScaler()
+    train = scaler.scale_train(series[fitted.start:fitted.cutoff])
+
+    start = time.perf_counter()
+    with TRACER.stage("fit", group=repr(strategy), function="_run_folds") as record:
+        model = forecaster.build_model()
+        model.fit(train)
+
+        if record is not None:
+            record.rows, record.series = len(train), 1
+
+    fit_seconds = time.perf_counter() - start
+
+    rows, actuals, forecasts, insamples = [], [], [], []
+    for fold in folds:
+
+        with TRACER.stage("predict", group=repr(strategy), function="_run_folds"):
+
+            if model.supports_transferable_series_prediction:
+                # Condition on the data up to this fold's cutoff
+                lead = 1
+                forecast = model.predict(
+                    horizon, series=scaler.transform(series[fold.start:fold.cutoff])
+                )
+            else:
+                lead = fold.cutoff - fitted.cutoff + 1
+                forecast = model.predict(lead - 1 + horizon)[-horizon:]
+
+        forecast = scaler.inverse(forecast)
+
+        values = series.values(copy=False)[:, 0]
+        actuals.append(values[fold.cutoff:fold.cutoff + horizon])
+        forecasts.append(forecast.values(copy=False)[:, 0])
+        insamples.append(values[fold.start:fold.cutoff])
+
+        rows.append({
+            "fold": fold.number,
+            "train_start": series.time_index[fold.start],
+            "cutoff": series.time_index[fold.cutoff],
+            "train_days": fitted.cutoff - fitted.start,
+            "refit": fold.refit,
+            "lead_start": lead,
+            "lead_end": lead + horizon - 1,
+            "fit_seconds": fit_seconds if fold.refit else 0.0,
+        })
+
+    # Score every fold of the task in one pass
+    metrics = BatchMetrics.create(
+        actual=np.stack(actuals),
+        forecast=np.stack(forecasts),
+        insample=pad_rows(insamples),
+        season=season,
+    ).to_frame()
+
+    return [{**row, **scores} for row, scores in zip(rows, metrics.to_dict("records"))]
@@ -1,9 +1,68 @@
-
-from dataclasses import dataclass
-from typing import cast
+from dataclasses import asdict, dataclass
+from typing import Optional, Sequence
 
 from darts import TimeSeries
-from darts.metrics import mae, rmse, mape
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, slots=True)
+class BatchMetrics:
+    """Error metrics for many aligned series at once, one value per row.
+
+    Inputs are ``(series, horizon)`` arrays; NaN marks padding and is ignored.
+    Zero actuals are left out of MAPE, and points where both actual and
+    forecast are zero are left out of sMAPE, so neither divides by zero.
+    """
+
+    mae: np.ndarray
+    rmse: np.ndarray
+    mape: np.ndarray
+    smape: np.ndarray
+    mase: np.ndarray
+    bias: np.ndarray
+
+    @classmethod
+    def create(cls,
+               actual: np.ndarray,
+               forecast: np.ndarray,
+               insample: Optional[np.ndarray] = None,
+               season: int = 1) -> "BatchMetrics":
+
+        actual = np.atleast_2d(np.asarray(actual, dtype=float))
+        forecast = np.atleast_2d(np.asarray(forecast, dtype=float))
+
+        error = forecast - actual
+        absolute = np.abs(error)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            mae = _nanmean(absolute)
+
+            percentage = np.where(actual != 0, absolute / np.abs(actual), np.nan)
+
+            denominator = np.abs(actual) + np.abs(forecast)
+            symmetric = np.where(denominator != 0, absolute / denominator, np.nan)
+
+            # Scaled by the in-sample seasonal naive error of each series
+            if insample is None:
+                mase = np.full(len(actual), np.nan)
+            else:
+                insample = np.atleast_2d(np.asarray(insample, dtype=float))
+                naive = _nanmean(np.abs(insample[:, season:] - insample[:, :-season]))
+                mase = np.where(naive > 0, mae / naive, np.nan)
+
+            return cls(
+                mae=mae,
+                rmse=np.sqrt(_nanmean(error ** 2)),
+                mape=100 * _nanmean(percentage),
+                smape=200 * _nanmean(symmetric),
+                mase=mase,
+                bias=_nanmean(error),
+            )
+
+    def to_frame(self, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        return pd.DataFrame(asdict(self), index=index)
 
 
 @dataclass(frozen=True, slots=True)
@@ -17,10 +76,17 @@ class MetricsResult:
                actual: TimeSeries, 
                forecast: TimeSeries):
         
+        actual, forecast = actual.slice_intersect(forecast), forecast.slice_intersect(actual)
+
+        batch = BatchMetrics.create(
+            actual=actual.values(copy=False).ravel(),
+            forecast=forecast.values(copy=False).ravel()
+        )
+
         return cls(
-            mae=cast(float, mae(actual, forecast)),
-            rmse=cast(float, rmse(actual, forecast)),
-            mape=cast(float, mape(actual, forecast)),
+            mae=float(batch.mae[0]),
+            rmse=float(batch.rmse[0]),
+            mape=float(batch.mape[0]),
         )
     
     def display(self) -> None:
@@ -28,4 +94,30 @@ class MetricsResult:
         print("\nValidation Metrics:")
         print(f"MAE: {self.mae:.3f}")
         print(f"RMSE: {self.rmse:.3f}")
-        print(f"MAPE: {self.mape:.3f}")
\ No newline at end of file
+        print(f"MAPE: {self.mape:.3f}")
+
+
+def stack_values(series: Sequence[TimeSeries]) -> np.ndarray:
+    """Univariate series as rows of a 2D array, NaN-padded to the longest."""
+
+    return pad_rows([single.values(copy=False)[:, 0] for single in series])
+
+
+def pad_rows(rows: Sequence[np.ndarray]) -> np.ndarray:
+
+    longest = max((len(row) for row in rows), default=0)
+
+    stacked = np.full((len(rows), longest), np.nan)
+    for i, row in enumerate(rows):
+        stacked[i, :len(row)] = row
+
+    return stacked
+
+
+def _nanmean(values: np.ndarray) -> np.ndarray:
+
+    # Rows that are entirely NaN give NaN without a RuntimeWarning
+    counts = np.sum(~np.isnan(values), axis=1)
+    totals = np.nansum(values, axis=1)
+
+    return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
@@ -1,17 +1,21 @@
 
 
 from dataclasses import dataclass, field
+from typing import Any, Optional
 
-from darts.models import AutoARIMA
+from darts import TimeSeries
+from darts.models import AutoARIMA, StatsForecastModel
 from matplotlib import pyplot as plt
 from matplotlib.ticker import ScalarFormatter
 import pandas as pd
 
 from forecast.data.transformer_pipeline import DataSplit, DataTransformer
 from forecast.evaluation.metrics import MetricsResult
-from forecast.models.base_forecaster import BaseForecaster
+from forecast.models.base_forecaster import UpdatableForecaster
 from forecast.models.base_config import BaseConfig
+from forecast.models.order_memory import ArimaOrder, OrderMemory
 from utils.errors import ModelNotTrainedError
+from utils.instrumentation import traced
 
 @dataclass
 class ArimaConfig(BaseConfig):
@@ -30,51 +34,110 @@ class ArimaConfig(BaseConfig):
     stepwise: bool = False
     approximation: bool = False
     trace: bool = True
+    warm_start_radius: int = 1
+    warm_start_tolerance: float = 0.05
+    update_refit_every: int = 7
 
 @dataclass
-class ArimaForecaster(BaseForecaster):
+class ArimaForecaster(UpdatableForecaster):
 
     config: ArimaConfig
 
-    model: AutoARIMA = field(init=False)
+    model: AutoARIMA | StatsForecastModel = field(init=False)
     transformer: DataTransformer = field(init=False)
     datasplit: DataSplit = field(init=False)
 
+    order_memory: Optional[OrderMemory] = field(default=None, kw_only=True)
+
     def __post_init__(self) -> None:
 
         self.transformer = DataTransformer(config=self.config, 
                                            schema=self.schema, 
                                            strategy=self.strategy)
 
-        self.model = AutoARIMA(start_p=self.config.start_p,
-                               start_q=self.config.start_q,
-                               max_p=self.config.max_p,
-                               max_q=self.config.max_q,
-                               max_P=self.config.max_P,
-                               max_Q=self.config.max_Q,
-                               max_D=self.config.max_D,
-                               d=self.config.d,
-                               D=self.config.D,
-                               seasonal=self.config.seasonal,
-                               season_length=self.config.season_length,
-                               stepwise=self.config.stepwise,
-                               trace=self.config.trace,
-                               approximation=self.config.approximation)
+        self.model = self.build_model()
 
 
-    def fit(self, sales: pd.DataFrame) -> None:
+    @traced("fit")
+    def fit(self, sales: pd.DataFrame, holdout: bool = True) -> None:
 
         self.datasplit = self.transformer.transform(sales)
 
-        print("Starting Arima training...")
-        self.model.fit(self.datasplit.train)
-        print("Training complete!")
+        remembered = self.order_memory.get(self.strategy) if self.order_memory else None
+
+        if remembered is not None:
+
+            # Search a small neighbourhood of the last selected order first
+            self.model = self.build_model(
+                **remembered.neighbourhood(self.config.warm_start_radius)
+            )
+            self._fit_model("Arima", holdout)
+
+            order = ArimaOrder.from_fitted(self.model.model.model_)
+            if remembered.accepts(order.criterion, self.config.warm_start_tolerance):
+                print(f"Warm start selected {order} (previously {remembered})")
+                self._remember(order, holdout)
+                return
+
+            print(f"Warm start degraded from {remembered} to {order}, "
+                  "running full order search")
+            self.model = self.build_model()
+
+        self._fit_model("Arima", holdout)
+
+        if self.order_memory is not None:
+            self._remember(ArimaOrder.from_fitted(self.model.model.model_), holdout)
+
+
+    def _remember(self, order: ArimaOrder, holdout: bool) -> None:
+
+        self.order_memory.remember(self.strategy, order)
+
+        if self.fit_cache is None:
+            return
+
+        # The next warm start searches around this order and, on the same
+        # series, selects it again, so it can reuse this fit from the cache
+        neighbourhood = self.build_model(**order.neighbourhood(self.config.warm_start_radius))
+        key = self.fit_cache.key(
+            type(self), self._training_series(holdout), self.config, neighbourhood.model_params
+        )
+
+        if self.fit_cache.lookup(key) is None:
+            self.fit_cache.store(key, self.model)
+
+
+    def build_model(self, **overrides: Any) -> AutoARIMA:
+
+        params = dict(start_p=self.config.start_p,
+                      start_q=self.config.start_q,
+                      max_p=self.config.max_p,
+                      max_q=self.config.max_q,
+                      max_P=self.config.max_P,
+                      max_Q=self.config.max_Q,
+                      max_D=self.config.max_D,
+                      d=self.config.d,
+                      D=self.config.D,
+                      seasonal=self.config.seasonal,
+                      season_length=self.config.season_length,
+                      stepwise=self.config.stepwise,
+                      trace=self.config.trace,
+                      approximation=self.config.approximation)
+
+        # Never search beyond the configured upper bounds
+        for name in ("max_p", "max_q", "max_P", "max_Q"):
+            if name in overrides:
+                overrides[name] = min(overrides[name], params[name])
+
+        return AutoARIMA(**{**params, **overrides})
 
 
     def evaluate(self) -> None:
 
         if self.model is None:
             raise ModelNotTrainedError("Model must be fitted before evaluating")
+
+        self._require_validation()
         
         forecast = self.model.predict(len(self.datasplit.val))
 
@@ -98,6 +161,35 @@ class ArimaForecaster(BaseForecaster):
         plt.title("Arima Train / Validation Forecast Comparison")
         plt.show()
 
-    def predict(self) -> None:
+    @traced("predict")
+    def predict(self, days: int) -> TimeSeries:
+
+        if not hasattr(self, "datasplit"):
+            raise ModelNotTrainedError("Model must be fitted before predicting")
+
+        forecast = self._forecast_ahead(days)
+
+        return self.transformer.inverse(forecast)
+
+
+    def _update_model(self, history: TimeSeries, updates: int) -> None:
+
+        if updates % self.config.update_refit_every:
+            return
+
+        # Periodically re-estimate the coefficients at the selected order,
+        # a fixed-order fit so the search cannot move away from it
+        fitted = self.model.model.model_
+        order = ArimaOrder.from_fitted(fitted)
+
+        print(f"Re-estimating Arima {order} on {len(history)} points...")
+        model = StatsForecastModel(
+            model="ARIMA",
+            model_kwargs=order.fixed(
+                include_mean="intercept" in fitted["coef"],
+                include_drift="drift" in fitted["coef"],
+            ),
+        )
+        model.fit(history)
 
-        pass
\ No newline at end of file
+        self.model = model
@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar, Optional
 
+from darts import TimeSeries
 import pandas as pd
 
 from data.schema import ColumnSchema
+from forecast.data.transformer_pipeline import DataSplit
 from forecast.models.base_config import BaseConfig
+from forecast.models.fit_cache import FitCache
 from strategy.strategy import GroupingStrategy
+from utils.errors import ModelNotTrainedError, UpdateNotSupportedError
+from utils.instrumentation import traced
+
+if TYPE_CHECKING:
+    from forecast.models.registry import ModelRegistry
 
 @dataclass
 class BaseForecaster(ABC):
@@ -14,8 +24,26 @@ class BaseForecaster(ABC):
     strategy: GroupingStrategy
     config: BaseConfig
 
+    # Whether update() can fold new sales into a fitted model
+    supports_update: ClassVar[bool] = False
+
+    fit_cache: Optional[FitCache] = field(default=None, kw_only=True)
+
+    # Observed sales through the latest update, None until the first one
+    history: Optional[TimeSeries] = field(default=None, init=False)
+    updates: int = field(default=0, init=False)
+
+    # False once fitted on the validation window too, which leaves nothing to evaluate on
+    holdout: bool = field(default=True, init=False)
+
     @abstractmethod
-    def fit(self, sales: pd.DataFrame):
+    def build_model(self):
+        """A fresh, unfitted model built from the config."""
+        pass
+
+
+    @abstractmethod
+    def fit(self, sales: pd.DataFrame, holdout: bool = True):
         pass
     
 
@@ -29,4 +57,146 @@ class BaseForecaster(ABC):
         pass
 
 
-        
\ No newline at end of file
+    def update(self, new_sales: pd.DataFrame) -> None:
+        """Folds newly arrived sales into the fitted model without a full refit."""
+
+        raise UpdateNotSupportedError(
+            f"{type(self).__name__} does not support incremental updates, refit instead"
+        )
+
+
+    def _observed(self) -> TimeSeries:
+        """Scaled sales through the last observed day."""
+
+        if self.history is not None:
+            return self.transformer.scaler.transform(self.history)
+
+        return self.datasplit.train.append(self.datasplit.val)
+
+
+    def _forecast_ahead(self, days: int) -> TimeSeries | list[TimeSeries]:
+        """Scaled forecast of the ``days`` after the last observed day.
+
+        Models that accept a series at prediction time are conditioned on
+        everything observed. The rest can only forecast from the end of their
+        training series, so they must be fitted with ``holdout=False`` first.
+        """
+
+        observed = self._observed()
+
+        if self.model.supports_transferable_series_prediction:
+            return self.model.predict(days, series=observed)
+
+        if len(observed) > len(self.model.training_series):
+            raise ModelNotTrainedError(
+                f"{type(self).__name__} was fitted without the validation window, "
+                "fit with holdout=False before forecasting"
+            )
+
+        return self.model.predict(days)
+
+
+    def save(self, registry: "ModelRegistry") -> Path:
+
+        return registry.save(self)
+
+
+    @classmethod
+    def load(cls, 
+             registry: "ModelRegistry",
+             schema: ColumnSchema,
+             strategy: GroupingStrategy,
+             config: BaseConfig):
+
+        return registry.load(cls, schema=schema, strategy=strategy, config=config)
+
+
+    def _require_validation(self) -> None:
+
+        if not self.holdout:
+            raise ModelNotTrainedError(
+                "Model was fitted on the validation window, fit with holdout=True to evaluate"
+            )
+
+        # Updates fold the validation window and later days into the model
+        if self.updates:
+            raise ModelNotTrainedError(
+                "Model was updated past the validation window, refit to evaluate"
+            )
+
+
+    def _training_series(self, holdout: bool) -> TimeSeries | list[TimeSeries]:
+
+        # Production fits see the validation window too
+        return self.datasplit.train if holdout else self._observed()
+
+
+    def _fit_model(self, name: str, holdout: bool = True) -> None:
+
+        self.history = None
+        self.updates = 0
+        self.holdout = holdout
+
+        series = self._training_series(holdout)
+
+        key = None
+        if self.fit_cache is not None:
+            key = self.fit_cache.key(
+                type(self), series, self.config, self.model.model_params
+            )
+
+            cached = self.fit_cache.lookup(key)
+            if cached is not None:
+                self.model = cached
+                print(f"Reusing cached {name} fit")
+                return
+
+        print(f"Starting {name} training...")
+        self.model.fit(series)
+        print("Training complete!")
+
+        if key is not None:
+            self.fit_cache.store(key, self.model)
+
+
+@dataclass
+class UpdatableForecaster(BaseForecaster):
+    """A forecaster on a single series whose fitted model can take new sales."""
+
+    supports_update: ClassVar[bool] = True
+
+    datasplit: DataSplit = field(init=False)
+
+    @traced("update")
+    def update(self, new_sales: pd.DataFrame) -> None:
+        """Folds newly arrived sales into the fitted model without a full refit.
+
+        The scaler keeps the state fitted on the original training data.
+        """
+
+        if not hasattr(self, "datasplit"):
+            raise ModelNotTrainedError("Model must be fitted before updating")
+
+        history = self.history
+        if history is None:
+            history = self.transformer.inverse(
+                self.datasplit.train.append(self.datasplit.val)
+            )
+
+        history = self.transformer.extend(history, new_sales)
+        updates = self.updates + 1
+
+        # State only moves forward once the model has taken the update
+        self._update_model(self.transformer.scaler.transform(history), updates)
+
+        self.history = history
+        self.updates = updates
+
+
+    @abstractmethod
+    def _update_model(self, history: TimeSeries, updates: int) -> None:
+        """Refreshes ``self.model`` on the scaled history after the ``updates``-th update.
+
+        Replaces the model only once the new one is fitted.
+        """
+        pass
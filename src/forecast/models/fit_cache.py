@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+import hashlib
+from pathlib import Path
+import pickle
+from typing import Any, Optional, Sequence
+
+from darts import TimeSeries
+
+from forecast.models.base_config import BaseConfig
+from utils.cache import CacheIndex, fingerprint, write_atomic
+
+
+@dataclass
+class FitCache:
+    """Fitted models on local disk, keyed by training series and config."""
+
+    directory: Path
+    max_bytes: Optional[int] = 1 << 30
+
+    index: CacheIndex = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.index = CacheIndex(self.directory, max_bytes=self.max_bytes)
+
+    def key(self,
+            model_type: type,
+            train: TimeSeries | Sequence[TimeSeries],
+            config: BaseConfig,
+            params: Optional[dict[str, Any]] = None) -> str:
+
+        # Constructor params separate fits that override the config
+        return fingerprint(
+            model_type.__name__, config, sorted((params or {}).items()), series_digest(train)
+        )
+
+    def lookup(self, key: str) -> Optional[Any]:
+
+        path = self.index.lookup(key)
+        if path is None:
+            return None
+
+        with open(path, "rb") as handle:
+            model = pickle.load(handle)
+
+        # Persist the refreshed access time so eviction stays least-recently-used
+        self.index.flush()
+        return model
+
+    def store(self, key: str, model: Any) -> None:
+
+        path = self.index.path(key, ".pkl")
+
+        write_atomic(path, pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+        self.index.record(key, path, model=type(model).__name__)
+        self.index.flush()
+
+    def clear(self) -> None:
+        self.index.clear()
+
+
+def series_digest(series: TimeSeries | Sequence[TimeSeries]) -> str:
+
+    # repr() truncates long arrays, so hash the raw buffers instead
+    digest = hashlib.sha1()
+    for single in [series] if isinstance(series, TimeSeries) else series:
+        digest.update(single.values(copy=False).tobytes())
+        digest.update(single.time_index.asi8.tobytes())
+        digest.update(str(single.freq_str).encode())
+
+    return digest.hexdigest()
@@ -0,0 +1,105 @@
+from dataclasses import dataclass, field
+
+from darts import TimeSeries
+from darts.models import LinearRegressionModel
+import pandas as pd
+
+from forecast.data.transformer_pipeline import DataTransformer, GroupedSplit
+from forecast.evaluation.metrics import BatchMetrics, stack_values
+from forecast.models.base_forecaster import BaseForecaster
+from forecast.models.base_config import BaseConfig
+from utils.errors import ModelNotTrainedError
+from utils.instrumentation import traced
+
+
+@dataclass
+class GlobalConfig(BaseConfig):
+
+    lags: int = 28
+    output_chunk_length: int = 7
+    season_length: int = 7
+
+
+@dataclass
+class GlobalForecaster(BaseForecaster):
+    """One lagged regression trained across every group the strategy yields."""
+
+    config: GlobalConfig
+
+    model: LinearRegressionModel = field(init=False)
+    transformer: DataTransformer = field(init=False)
+    datasplit: GroupedSplit = field(init=False)
+
+    def __post_init__(self) -> None:
+
+        self.transformer = DataTransformer(config=self.config,
+                                           schema=self.schema,
+                                           strategy=self.strategy)
+
+        self.model = self.build_model()
+
+
+    def build_model(self) -> LinearRegressionModel:
+
+        return LinearRegressionModel(lags=self.config.lags,
+                                     output_chunk_length=self.config.output_chunk_length)
+
+
+    @traced("fit")
+    def fit(self, sales: pd.DataFrame, holdout: bool = True) -> None:
+
+        # Series without enough history for one lag window cannot be trained on
+        self.datasplit = self.transformer.transform_many(
+            sales,
+            min_train_length=self.config.lags + self.config.output_chunk_length
+        )
+
+        self._fit_model("Global", holdout)
+
+
+    def evaluate(self) -> pd.DataFrame:
+
+        if not hasattr(self, "datasplit"):
+            raise ModelNotTrainedError("Model must be fitted before evaluating")
+
+        self._require_validation()
+
+        forecasts = self.model.predict(len(self.datasplit.val[0]), series=self.datasplit.train)
+
+        forecasts = self.transformer.inverse_many(forecasts)
+        actuals = self.transformer.inverse_many(self.datasplit.val)
+
+        metrics = pd.concat([
+            pd.DataFrame(self.datasplit.groups),
+            BatchMetrics.create(
+                actual=stack_values(actuals),
+                forecast=stack_values(forecasts),
+                insample=stack_values(self.transformer.inverse_many(self.datasplit.train)),
+                season=self.config.season_length
+            ).to_frame()
+        ], axis=1)
+
+        print("\nValidation Metrics (mean over series):")
+        print(metrics[["mae", "rmse", "mape", "smape", "mase", "bias"]].mean()
+              .to_string(float_format="{:.3f}".format))
+
+        return metrics
+
+
+    def _observed(self) -> list[TimeSeries]:
+
+        return [
+            train.append(val) for train, val in zip(self.datasplit.train, self.datasplit.val)
+        ]
+
+
+    @traced("predict")
+    def predict(self, days: int) -> list[TimeSeries]:
+        """Forecasts for every series, in the order of ``datasplit.groups``."""
+
+        if not hasattr(self, "datasplit"):
+            raise ModelNotTrainedError("Model must be fitted before predicting")
+
+        forecasts = self._forecast_ahead(days)
+
+        return self.transformer.inverse_many(forecasts)
@@ -0,0 +1,108 @@
+from dataclasses import asdict, dataclass, field
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+from strategy.strategy import GroupingStrategy
+from utils.cache import file_lock, write_atomic
+
+
+@dataclass(frozen=True)
+class ArimaOrder:
+
+    p: int
+    d: int
+    q: int
+    P: int
+    D: int
+    Q: int
+    season_length: int
+    criterion: float
+
+    @classmethod
+    def from_fitted(cls, fitted: dict[str, Any]) -> "ArimaOrder":
+
+        # statsforecast packs the orders as (p, q, P, Q, m, d, D)
+        p, q, P, Q, m, d, D = (int(value) for value in fitted["arma"])
+
+        return cls(p=p, d=d, q=q, P=P, D=D, Q=Q,
+                   season_length=m, criterion=float(fitted["aicc"]))
+
+    def neighbourhood(self, radius: int) -> dict[str, Any]:
+
+        # Differencing is held fixed and the stepwise search starts at the
+        # remembered order, only free to move `radius` steps upwards
+        return {
+            "d": self.d,
+            "D": self.D,
+            "start_p": self.p,
+            "start_q": self.q,
+            "start_P": self.P,
+            "start_Q": self.Q,
+            "max_p": self.p + radius,
+            "max_q": self.q + radius,
+            "max_P": self.P + radius,
+            "max_Q": self.Q + radius,
+            "max_order": self.p + self.q + self.P + self.Q + 2 * radius,
+            "stepwise": True,
+        }
+
+    def fixed(self,
+              include_mean: bool,
+              include_drift: bool) -> dict[str, Any]:
+
+        # Arguments for statsforecast's ARIMA, which estimates this exact order
+        return {
+            "order": (self.p, self.d, self.q),
+            "seasonal_order": (self.P, self.D, self.Q),
+            "season_length": self.season_length,
+            "include_mean": include_mean,
+            "include_drift": include_drift,
+        }
+
+    def accepts(self, criterion: float, tolerance: float) -> bool:
+        return criterion <= self.criterion + tolerance * abs(self.criterion)
+
+    def __str__(self) -> str:
+        return (f"({self.p},{self.d},{self.q})"
+                f"({self.P},{self.D},{self.Q})[{self.season_length}]")
+
+
+@dataclass
+class OrderMemory:
+    """Last selected ARIMA order per group, kept in a small JSON file."""
+
+    path: Path
+
+    orders: dict[str, ArimaOrder] = field(init=False)
+
+    def __post_init__(self) -> None:
+
+        self.path = Path(self.path)
+
+        self.orders = (
+            {key: ArimaOrder(**order) for key, order in json.loads(self.path.read_text()).items()}
+            if self.path.exists() else {}
+        )
+
+    def get(self, strategy: GroupingStrategy) -> Optional[ArimaOrder]:
+        return self.orders.get(repr(strategy))
+
+    def remember(self, strategy: GroupingStrategy, order: ArimaOrder) -> None:
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Merge with orders other processes remembered since this file was read
+        with file_lock(self.path.with_name(self.path.name + ".lock")):
+
+            if self.path.exists():
+                self.orders.update(
+                    (key, ArimaOrder(**stored))
+                    for key, stored in json.loads(self.path.read_text()).items()
+                )
+
+            self.orders[repr(strategy)] = order
+
+            write_atomic(self.path, json.dumps(
+                {key: asdict(value) for key, value in self.orders.items()}, indent=2
+            ))
@@ -1,16 +1,22 @@
 
 from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
+import prophet
+from darts import TimeSeries
 from darts.models import Prophet
 from matplotlib import pyplot as plt
 from matplotlib.ticker import ScalarFormatter
 
 from forecast.data.transformer_pipeline import DataSplit, DataTransformer
 from forecast.evaluation.metrics import MetricsResult
-from forecast.models.base_forecaster import BaseForecaster
+from forecast.models.base_forecaster import UpdatableForecaster
 from forecast.models.base_config import BaseConfig
 from utils.errors import ModelNotTrainedError
+from utils.instrumentation import traced
 
 
 @dataclass
@@ -25,7 +31,7 @@ class ProphetConfig(BaseConfig):
 
 
 @dataclass
-class ProphetForecaster(BaseForecaster):
+class ProphetForecaster(UpdatableForecaster):
 
     config: ProphetConfig
 
@@ -39,26 +45,38 @@ class ProphetForecaster(BaseForecaster):
                                            schema=self.schema, 
                                            strategy=self.strategy)
         
-        self.model = Prophet(yearly_seasonality=self.config.yearly_seasonality,
-                             weekly_seasonality=self.config.weekly_seasonality,
-                             daily_seasonality=self.config.daily_seasonality,
-                             seasonality_mode=self.config.seasonality_mode,
-                             changepoint_prior_scale=self.config.change_prior_scale,
-                             changepoint_range=self.config.checkpoint_range)
+        self.model = self.build_model()
     
-    def fit(self, sales: pd.DataFrame) -> None:
+
+    def build_model(self, init: Optional[dict[str, Any]] = None) -> Prophet:
+
+        params = dict(yearly_seasonality=self.config.yearly_seasonality,
+                      weekly_seasonality=self.config.weekly_seasonality,
+                      daily_seasonality=self.config.daily_seasonality,
+                      seasonality_mode=self.config.seasonality_mode,
+                      changepoint_prior_scale=self.config.change_prior_scale,
+                      changepoint_range=self.config.checkpoint_range)
+
+        if init is not None:
+            return WarmStartProphet(init=init, **params)
+
+        return Prophet(**params)
+    
+
+    @traced("fit")
+    def fit(self, sales: pd.DataFrame, holdout: bool = True) -> None:
 
         self.datasplit = self.transformer.transform(sales)
 
-        print("Starting Prophet training...")
-        self.model.fit(self.datasplit.train)
-        print("Training complete!")
+        self._fit_model("Prophet", holdout)
 
     
     def evaluate(self) -> None:
 
         if self.model is None:
             raise ModelNotTrainedError("Model must be fitted before evaluating")
+
+        self._require_validation()
         
         forecast = self.model.predict(len(self.datasplit.val))
 
@@ -83,5 +101,73 @@ class ProphetForecaster(BaseForecaster):
         plt.show()
 
 
-    def predict(self):
-        pass
\ No newline at end of file
+    @traced("predict")
+    def predict(self, days: int) -> TimeSeries:
+
+        if not hasattr(self, "datasplit"):
+            raise ModelNotTrainedError("Model must be fitted before predicting")
+
+        forecast = self._forecast_ahead(days)
+
+        return self.transformer.inverse(forecast)
+
+
+    def _update_model(self, history: TimeSeries, updates: int) -> None:
+
+        previous = self.model.model
+
+        # Start the optimiser from the previous fit's parameters
+        model = self.build_model(init=_warm_start_params(previous))
+
+        print(f"Warm-starting Prophet on {len(history)} points...")
+        model.fit(history)
+
+        self.model = model
+
+
+class WarmStartProphet(Prophet):
+    """darts Prophet whose fits start the optimiser from ``init``.
+
+    darts builds the underlying ``prophet.Prophet`` in ``_fit`` from its
+    ``_model_builder`` attribute, which has no public counterpart (checked
+    against darts 0.47). This is the only darts internal the module relies
+    on, and construction fails loudly if it goes away.
+    """
+
+    def __init__(self, init: dict[str, Any], **kwargs: Any) -> None:
+
+        super().__init__(**kwargs)
+
+        if not hasattr(self, "_model_builder"):
+            raise RuntimeError(
+                "This darts version does not expose Prophet._model_builder, "
+                "warm-started updates need darts 0.47"
+            )
+
+        self.init = init
+        self._model_builder = partial(_InitialisedProphet, init=init)
+
+
+class _InitialisedProphet(prophet.Prophet):
+
+    def __init__(self, init: dict[str, Any], **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.init = init
+
+    def fit(self, df: pd.DataFrame, **kwargs: Any) -> "_InitialisedProphet":
+        return super().fit(df, init=self.init, **kwargs)
+
+
+def _warm_start_params(model: prophet.Prophet) -> dict[str, Any]:
+
+    # MAP fits keep one draw, MCMC fits are averaged over the samples
+    params = {}
+    for name in ("k", "m", "sigma_obs"):
+        params[name] = (model.params[name][0][0] if model.mcmc_samples == 0
+                        else np.mean(model.params[name]))
+
+    for name in ("delta", "beta"):
+        params[name] = (model.params[name][0] if model.mcmc_samples == 0
+                        else np.mean(model.params[name], axis=0))
+
+    return params
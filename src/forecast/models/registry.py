@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from pathlib import Path
+import pickle
+from typing import TYPE_CHECKING, TypeVar
+
+from data.schema import ColumnSchema
+from forecast.models.base_config import BaseConfig
+from strategy.strategy import GroupingStrategy
+from utils.cache import fingerprint
+from utils.errors import ModelNotTrainedError
+
+if TYPE_CHECKING:
+    from forecast.models.base_forecaster import BaseForecaster
+
+F = TypeVar("F", bound="BaseForecaster")
+
+
+@dataclass
+class ModelRegistry:
+    """Fitted forecasters on disk, keyed by model type, strategy and config."""
+
+    directory: Path
+
+    def path(self,
+             model_type: type,
+             strategy: GroupingStrategy,
+             config: BaseConfig) -> Path:
+
+        return (
+            Path(self.directory)
+            / model_type.__name__
+            / fingerprint(strategy)[:16]
+            / f"{config_hash(config)}.pkl"
+        )
+
+    def save(self, forecaster: "BaseForecaster") -> Path:
+
+        if not hasattr(forecaster, "datasplit"):
+            raise ModelNotTrainedError("Model must be fitted before saving")
+
+        path = self.path(type(forecaster), forecaster.strategy, forecaster.config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        state = {
+            "strategy": forecaster.strategy,
+            "config": forecaster.config,
+            "model": forecaster.model,
+            "scaler": forecaster.transformer.scaler,
+            "datasplit": forecaster.datasplit,
+            "history": forecaster.history,
+            "updates": forecaster.updates,
+            "holdout": forecaster.holdout,
+        }
+
+        with open(path, "wb") as handle:
+            pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return path
+
+    def load(self,
+             model_type: type[F],
+             schema: ColumnSchema,
+             strategy: GroupingStrategy,
+             config: BaseConfig) -> F:
+
+        path = self.path(model_type, strategy, config)
+
+        if not path.exists():
+            raise ModelNotTrainedError(
+                f"No saved {model_type.__name__} for {strategy} with this config"
+            )
+
+        with open(path, "rb") as handle:
+            state = pickle.load(handle)
+
+        forecaster = model_type(schema=schema, strategy=strategy, config=config)
+        forecaster.model = state["model"]
+        forecaster.transformer.scaler = state["scaler"]
+        forecaster.datasplit = state["datasplit"]
+        forecaster.history = state.get("history")
+        forecaster.updates = state.get("updates", 0)
+        forecaster.holdout = state.get("holdout", True)
+
+        return forecaster
+
+    def exists(self,
+               model_type: type,
+               strategy: GroupingStrategy,
+               config: BaseConfig) -> bool:
+
+        return self.path(model_type, strategy, config).exists()
+
+
+def config_hash(config: BaseConfig) -> str:
+    return fingerprint(type(config).__name__, config)
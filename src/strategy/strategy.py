@@ -26,6 +26,11 @@ class GroupingStrategy(ABC):
                     schema: ColumnSchema) -> pd.DataFrame:
         pass
     
+    @abstractmethod
+    def get_predicates(self, 
+                       schema: ColumnSchema) -> dict[str, Any]:
+        pass
+
     @abstractmethod
     def get_group_identifier(self, 
                              group_key: tuple) -> dict[str, Any]:
@@ -66,6 +71,14 @@ class ProductStrategy(GroupingStrategy):
 
         return data
 
+    def get_predicates(self, 
+                       schema: ColumnSchema):
+        
+        if self.product is None:
+            return {}
+        
+        return {schema.product: self.product}
+
     def get_group_identifier(self, 
                              group_key: tuple):
         
@@ -113,6 +126,19 @@ class StationByProductStrategy(GroupingStrategy):
         
         return data
     
+    def get_predicates(self, 
+                       schema: ColumnSchema):
+        
+        predicates: dict[str, Any] = {}
+
+        if self.station is not None:
+            predicates[schema.station] = self.station
+
+        if self.product is not None:
+            predicates[schema.product] = self.product
+
+        return predicates
+    
     def get_group_identifier(self, group_key: tuple):
 
         if isinstance(group_key, tuple) and len(group_key) >= 2:
@@ -0,0 +1,199 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterator, Optional
+
+
+def fingerprint(*parts: Any) -> str:
+
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\x00")
+
+    return digest.hexdigest()
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive advisory lock on ``path``, held across processes.
+
+    Uses ``fcntl`` on POSIX and ``msvcrt`` on Windows.
+    """
+
+    with open(path, "a") as handle:
+
+        try:
+            import fcntl
+        except ImportError:
+            fcntl = None
+
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            return
+
+        import msvcrt
+
+        # LK_LOCK gives up after about ten seconds, so keep asking
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue
+
+        try:
+            yield
+        finally:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_atomic(path: Path, data: str | bytes) -> None:
+
+    # Staged under a per-process name, so concurrent writers never share
+    # a temporary file and readers only ever see a complete one
+    path = Path(path)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+    if isinstance(data, bytes):
+        staging.write_bytes(data)
+    else:
+        staging.write_text(data)
+
+    staging.replace(path)
+
+
+@dataclass
+class CacheIndex:
+    """JSON manifest of cached files with least-recently-used eviction.
+
+    Several processes may share a directory: ``flush`` merges with the
+    manifest on disk under a lock instead of overwriting it.
+    """
+
+    directory: Path
+    max_bytes: Optional[int] = None
+
+    entries: dict[str, dict[str, Any]] = field(init=False)
+    _discarded: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.entries = (
+            json.loads(self.manifest.read_text())
+            if self.manifest.exists() else {}
+        )
+
+    @property
+    def manifest(self) -> Path:
+        return self.directory / "manifest.json"
+
+    @property
+    def lock(self) -> Path:
+        return self.directory / "manifest.lock"
+
+    def path(self, key: str, suffix: str = "") -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def lookup(self, key: str) -> Optional[Path]:
+
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        path = self.directory / entry["file"]
+        if not path.exists():
+            del self.entries[key]
+            return None
+
+        entry["accessed"] = time.time()
+        return path
+
+    def record(self, key: str, path: Path, **metadata: Any) -> None:
+
+        self._discarded.discard(key)
+        self.entries[key] = {
+            "file": path.name,
+            "bytes": path.stat().st_size,
+            "accessed": time.time(),
+            **metadata,
+        }
+
+    def discard(self, key: str) -> None:
+
+        entry = self.entries.pop(key, None)
+        self._discarded.add(key)
+
+        if entry is not None:
+            (self.directory / entry["file"]).unlink(missing_ok=True)
+
+    def discard_where(self, predicate: Callable[[dict[str, Any]], bool]) -> None:
+
+        for key in [k for k, entry in self.entries.items() if predicate(entry)]:
+            self.discard(key)
+
+    def clear(self) -> None:
+
+        for key in list(self.entries):
+            self.discard(key)
+
+        self.flush()
+
+    def flush(self) -> None:
+
+        with file_lock(self.lock):
+
+            self._merge()
+            self._evict()
+
+            write_atomic(self.manifest, json.dumps(self.entries))
+            self._discarded.clear()
+
+    def _merge(self) -> None:
+
+        if not self.manifest.exists():
+            return
+
+        # Other processes may have recorded or discarded entries since this
+        # index was read; the newest access wins and discards stay discarded
+        stored = json.loads(self.manifest.read_text())
+
+        for key in [k for k in self.entries if k not in stored]:
+            if not (self.directory / self.entries[key]["file"]).exists():
+                del self.entries[key]
+
+        for key, entry in stored.items():
+            if key in self._discarded:
+                continue
+
+            current = self.entries.get(key)
+            if current is None or entry["accessed"] > current["accessed"]:
+                self.entries[key] = entry
+
+    def _evict(self) -> None:
+
+        if self.max_bytes is None:
+            return
+
+        total = sum(entry["bytes"] for entry in self.entries.values())
+        by_age = sorted(self.entries, key=lambda k: self.entries[k]["accessed"])
+
+        for key in by_age:
+            if total <= self.max_bytes:
+                break
+
+            total -= self.entries[key]["bytes"]
+            self.discard(key)
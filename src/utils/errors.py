@@ -12,4 +12,9 @@ class InsufficientDataError(ValueError):
 
 class ModelNotTrainedError(ValueError):
     """Raised when model is not yet trained or fitted"""
+    pass
+
+
+class UpdateNotSupportedError(ValueError):
+    """Raised when a model cannot take new data without a full refit"""
     pass
\ No newline at end of file
@@ -0,0 +1,261 @@
+from contextlib import contextmanager
+import csv
+from dataclasses import asdict, dataclass, field, fields
+from functools import wraps
+import json
+import os
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, Optional
+
+
+@dataclass
+class StageRecord:
+
+    stage: str
+    function: str
+    group: Optional[str]
+    parent: Optional[str]
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows: Optional[int] = None
+    series: Optional[int] = None
+    rss_delta_mb: Optional[float] = None
+    peak_rss_delta_mb: Optional[float] = None
+    allocated_bytes: Optional[int] = None
+    pid: int = 0
+
+
+@dataclass
+class Tracer:
+    """Collects per-stage timings and memory for one process.
+
+    Disabled by default, in which case traced calls cost one attribute check.
+    Work sent to other processes goes through ``run_traced`` so its records
+    come back with the results and are absorbed here.
+    """
+
+    enabled: bool = False
+    trace_memory: bool = False
+
+    records: list[StageRecord] = field(default_factory=list)
+    _stack: list[str] = field(default_factory=list, repr=False)
+
+    def enable(self, trace_memory: bool = False) -> None:
+
+        self.enabled = True
+        self.trace_memory = trace_memory
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+
+        self.enabled = False
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def clear(self) -> None:
+        self.records.clear()
+
+    @contextmanager
+    def stage(self,
+              name: str,
+              group: Optional[str] = None,
+              function: str = "") -> Iterator[Optional[StageRecord]]:
+
+        if not self.enabled:
+            yield None
+            return
+
+        record = StageRecord(
+            stage=name,
+            function=function or name,
+            group=group,
+            parent=self._stack[-1] if self._stack else None,
+            pid=os.getpid(),
+        )
+
+        self._stack.append(name)
+        allocated = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        rss, peak = _rss_mb(), _peak_rss_mb()
+        wall, cpu = time.perf_counter(), time.process_time()
+
+        try:
+            yield record
+
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+
+            # The process peak only moves when this stage set a new high
+            if peak is not None:
+                record.peak_rss_delta_mb = _peak_rss_mb() - peak
+            if rss is not None:
+                record.rss_delta_mb = _rss_mb() - rss
+
+            if allocated is not None:
+                record.allocated_bytes = tracemalloc.get_traced_memory()[0] - allocated
+
+            self._stack.pop()
+            self.records.append(record)
+
+    def settings(self) -> tuple[bool, bool]:
+        return self.enabled, self.trace_memory
+
+    def absorb(self, records: list[StageRecord]) -> None:
+
+        # Worker stages hang under whatever stage dispatched them
+        for record in records:
+            if record.parent is None and self._stack:
+                record.parent = self._stack[-1]
+
+        self.records.extend(records)
+
+    def to_json(self, path: Path) -> None:
+
+        Path(path).write_text(
+            json.dumps([asdict(record) for record in self.records], indent=2)
+        )
+
+    def to_csv(self, path: Path) -> None:
+
+        with open(path, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=[f.name for f in fields(StageRecord)])
+            writer.writeheader()
+            writer.writerows(asdict(record) for record in self.records)
+
+    def summary(self) -> list[dict[str, Any]]:
+
+        totals: dict[str, dict[str, Any]] = {}
+        for record in self.records:
+            total = totals.setdefault(record.stage, {
+                "stage": record.stage, "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0
+            })
+            total["calls"] += 1
+            total["wall_seconds"] += record.wall_seconds
+            total["cpu_seconds"] += record.cpu_seconds
+
+        return sorted(totals.values(), key=lambda total: -total["wall_seconds"])
+
+
+TRACER = Tracer()
+
+
+def run_traced(settings: tuple[bool, bool],
+               function: Callable,
+               *args: Any,
+               **kwargs: Any) -> tuple[Any, list[StageRecord]]:
+    """Calls ``function`` in a worker under the parent's ``TRACER.settings()``.
+
+    Returns the result with the records it produced, for ``TRACER.absorb``.
+    """
+
+    enabled, trace_memory = settings
+    if not enabled:
+        return function(*args, **kwargs), []
+
+    TRACER.enable(trace_memory)
+
+    # Forked workers inherit the parent's records, only new ones go back
+    start = len(TRACER.records)
+    result = function(*args, **kwargs)
+
+    records = TRACER.records[start:]
+    del TRACER.records[start:]
+
+    return result, records
+
+
+def traced(stage: str) -> Callable:
+    """Records a call as ``stage`` when the module tracer is enabled.
+
+    The group label comes from the ``strategy`` of the bound instance, if any,
+    and row/series counts from the returned value, or from the instance's
+    ``datasplit`` when nothing is returned.
+    """
+
+    def decorator(function: Callable) -> Callable:
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+
+            if not TRACER.enabled:
+                return function(*args, **kwargs)
+
+            strategy = getattr(args[0], "strategy", None) if args else None
+
+            with TRACER.stage(
+                stage,
+                group=None if strategy is None else repr(strategy),
+                function=function.__qualname__
+            ) as record:
+
+                result = function(*args, **kwargs)
+
+                counted = result
+                if counted is None and args:
+                    # Fitting returns nothing, its split holds the counts
+                    counted = getattr(args[0], "datasplit", None)
+
+                record.rows, record.series = _counts(counted)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _counts(result: Any) -> tuple[Optional[int], Optional[int]]:
+
+    # Duck-typed so this module imports neither pandas nor darts
+    if hasattr(result, "train") and hasattr(result, "val"):
+        train, val = result.train, result.val
+        if isinstance(train, list):
+            return sum(len(s) for s in train) + sum(len(s) for s in val), len(train)
+        return len(train) + len(val), 1
+
+    if isinstance(result, list):
+        return sum(_len(item) for item in result), len(result)
+
+    if hasattr(result, "time_index"):
+        return len(result), 1
+
+    if hasattr(result, "shape"):
+        return len(result), None
+
+    return None, None
+
+
+def _rss_mb() -> Optional[float]:
+
+    # Resident pages now, which unlike the peak can fall as well as rise
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def _peak_rss_mb() -> Optional[float]:
+
+    # resource is Unix-only, other platforms record no peak
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _len(item: Any) -> int:
+    try:
+        return len(item)
+    except TypeError:
+        return 0